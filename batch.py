@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Rev 1.0 - 18 Oct 26
+    Renders images from the iterations in "generic" without the GUI, e.g. on
+    a machine with no display. The parameter sets are read from a json file
+    holding a list of jobs, each job being a dictionary of the keyword
+    arguments for the iteration plus:
+        "class": name of the iteration class, e.g. "Mandelbrot";
+        "args": (optional) list of positional arguments, e.g. [10] for
+                NComplexRoot;
+        "fname": (optional) file for the image, otherwise one is made up.
+    For example:
+        [{"class": "Mandelbrot", "xStart": -0.6258, "xEnd": -0.6264,
+          "yStart": 0.40332, "xSize": 600, "palette": "10CAL_10",
+          "maxIter": 550, "contours": 200, "fname": "m2.png"},
+         {"class": "NComplexRoot", "args": [10], "xSize": 600}]
+    Usage:
+        python batch.py jobs.json [--dir ../images] [--processes 4]
+    All jobs are rendered in the one process (which may use a pool of
+    processes for each image, see "processes").
+@author: Owner
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+import json
+import generic
+
+def render_jobs(jobs, fileDir=".", processes=None):
+    #Render each job (a dictionary, as described above) in turn
+    for n, job in enumerate(jobs):
+        kwargs = dict(job)
+        className = kwargs.pop("class")
+        args = kwargs.pop("args", [])
+        fname = kwargs.pop("fname", "{}_{:03d}.png".format(className, n))
+        if processes is not None:
+            kwargs.setdefault("processes", processes)
+        iterClass = getattr(generic, className, None)
+        if not (isinstance(iterClass, type)
+                and issubclass(iterClass, generic.GenIteration)):
+            print("Job", n, "- no such iteration:", className)
+            continue
+        startTime = datetime.now()
+        iteration = iterClass(None, *args, **kwargs)
+        iteration.render(fileDir + "/" + fname)
+        print("Job", n, fname, "- runtime =", datetime.now() - startTime)
+
+#MAIN
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Render images from generic.py "
+                            "iterations without the GUI.")
+    parser.add_argument("jobs", help="json file: a list of parameter sets")
+    parser.add_argument("--dir", default=".",
+                        help="directory for the images")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes for each image")
+    options = parser.parse_args()
+    with open(options.jobs) as jobFile:
+        render_jobs(json.load(jobFile), options.dir, options.processes)
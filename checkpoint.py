@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Checkpoints, for the programs which plot points (feigenbaum, henon). The
+state of a render - where the orbits have got to, the hits so far and the
+parameters - is saved to disk (numpy savez, .npz), so that a longer run can
+carry on from it rather than starting again from the seed.
+Rev 1.0 - 18 Oct 26
+@author: Owner
+"""
+import json
+import numpy as np
+
+def save_checkpoint(fname, parameters, **arrays):
+    #Save the arrays, with the parameters (a dict of numbers, strings and
+    #lists) they belong to. numpy adds .npz to fname if missing.
+    np.savez(fname, parameters=to_json(parameters), **arrays)
+
+def load_checkpoint(fname, parameters=None):
+    #The arrays saved in fname, as a dict. If parameters are given, they
+    #must be those saved.
+    with np.load(fname) as data:
+        saved = json.loads(str(data["parameters"]))
+        arrays = {name: data[name] for name in data.files
+                  if name != "parameters"}
+    if parameters is not None:
+        check_parameters(saved, parameters)
+    return arrays
+
+def check_parameters(saved, parameters):
+    #(compared as saved, i.e. tuples become lists)
+    parameters = json.loads(to_json(parameters))
+    different = sorted(name for name in set(saved) | set(parameters)
+                       if saved.get(name) != parameters.get(name))
+    if different:
+        raise ValueError("Checkpoint has different " + ", ".join(different))
+
+def to_json(parameters):
+    #(numpy numbers and arrays as plain numbers and lists)
+    return json.dumps(parameters, default=lambda v: np.asarray(v).tolist())
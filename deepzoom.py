@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Deep zoom into the Mandelbrot set (z := z**2 + c) by perturbation.
+Rev 1.0 - 18 Oct 26
+    Beyond a width of about 1e-13 the pixels of an image can no longer be told
+    apart in float64. Instead, one "reference" orbit Z is computed at high
+    precision (Decimal), and for each pixel only its difference d from that
+    orbit is iterated, in float64:
+        d := 2*Z*d + d**2 + dc
+    where dc is the pixel's distance from the reference point. Where this
+    goes wrong ("glitches": |Z + d| becomes very much smaller than |Z|) the
+    pixels concerned are iterated again with one of them as a new reference.
+Rev 1.1 - 18 Oct 26
+    Series approximation: for the first iterations d follows, very nearly,
+        d = A*dc + B*dc**2 + C*dc**3
+    with A, B, C iterated once, along the reference orbit. This is checked
+    against "probe" points (the corners of the view); all pixels then start
+    from the last iteration at which it held, instead of from 0.
+Rev 1.2 - 18 Oct 26
+    * The extra references made for glitches are kept (in a list given by 
+      the caller) and tried first by later calls, e.g. for the next band.
+    * Points still glitched after MAX_REFERENCES new references are iterated
+      singly in Decimal (exact_count), so no glitch is left in the result.
+    * The series is checked at the centre and the edge midpoints of the view
+      as well as the corners (probe_points).
+@author: Owner
+"""
+from decimal import Decimal, localcontext
+import numpy as np
+
+GLITCH_TOLERANCE = 1e-3 #|Z + d| < this * |Z| is a glitch
+MAX_REFERENCES = 12 #most new reference orbits for one call to deep_count
+MAX_KEPT = 48 #most extra references kept for later calls
+SERIES_TOLERANCE = 1e-12 #relative error allowed in the series, at the probes
+
+def reference_orbit(cReal, cImag, zReal, zImag, maxIter, limit, precision):
+    #Orbit of z := z**2 + c, computed in Decimal to precision digits, given
+    #as an array of complex values (z0, z1, ...). It ends with the first
+    #value for which |z|**2 > limit, if there is one.
+    orbit = np.empty(maxIter, dtype=np.complex128)
+    with localcontext() as context:
+        context.prec = precision
+        cReal, cImag = Decimal(cReal), Decimal(cImag)
+        x, y = Decimal(zReal), Decimal(zImag)
+        limit = Decimal(limit)
+        for n in range(maxIter):
+            orbit[n] = complex(float(x), float(y))
+            xSq = x*x
+            ySq = y*y
+            if xSq + ySq > limit:
+                return orbit[:n + 1]
+            y = x*y
+            y = y + y + cImag
+            x = xSq - ySq + cReal
+        #end_for_n
+    return orbit
+
+def exact_count(cReal, cImag, zReal, zImag, maxIter, limit, precision):
+    #Escape count (-1 if none) for the single point c, iterated in Decimal
+    orbit = reference_orbit(cReal, cImag, zReal, zImag, maxIter, limit, 
+                            precision)
+    last = orbit[-1]
+    if orbit.size < maxIter or last.real*last.real + last.imag*last.imag \
+                               > limit:
+        return orbit.size - 1
+    return -1
+
+def probe_points(xStart, xEnd, yStart, yEnd):
+    #Points at which the series approximation is checked: a 3 x 3 grid over
+    #the view (distances from the reference), i.e. the corners, the edge 
+    #midpoints and the centre.
+    x = np.linspace(xStart, xEnd, 3)
+    y = np.linspace(yStart, yEnd, 3)
+    return (x[np.newaxis, :] + 1j*y[:, np.newaxis]).ravel()
+
+def series_approximation(orbit, dcProbes, maxIter, limit):
+    #Iterate the series coefficients
+    #    A := 2*Z*A + 1,  B := 2*Z*B + A**2,  C := 2*Z*C + 2*A*B
+    #alongside d for the probe points (array dcProbes), for as long as the
+    #series gives d to within SERIES_TOLERANCE and no probe has escaped.
+    #Returns (skip, A, B, C): the iteration reached and the coefficients 
+    #there. skip is 0 if the series is no use.
+    series = (0, 0j, 0j, 0j)
+    A = B = C = 0j
+    d = np.zeros(dcProbes.size, dtype=np.complex128)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for n in range(min(maxIter, orbit.size) - 1):
+            Z = orbit[n]
+            A, B, C = (Z + Z)*A + 1, (Z + Z)*B + A*A, (Z + Z)*C + 2*A*B
+            d = (Z + Z + d)*d + dcProbes
+            approx = ((C*dcProbes + B)*dcProbes + A)*dcProbes
+            z = orbit[n + 1] + d
+            #(written so that inf or nan also fail)
+            if not (np.abs(approx - d) <= SERIES_TOLERANCE*np.abs(d)).all() \
+               or (z.real*z.real + z.imag*z.imag > limit).any():
+                break
+            series = (n + 1, A, B, C)
+        #end_for_n
+    return series
+
+def perturbation_count(dc, orbit, maxIter, limit, start=0, d=None):
+    #Iterate d := 2*Z*d + d**2 + dc for the array dc, against the reference
+    #orbit Z, from iteration start with the given d (default 0).
+    #Returns the iteration at which each point escaped (-1 if not) and
+    #whether it glitched (also if the reference orbit ended too soon).
+    count = np.full(dc.size, -1, dtype=np.int32)
+    glitched = np.zeros(dc.size, dtype=bool)
+    if d is None:
+        d = np.zeros(dc.size, dtype=np.complex128)
+    active = np.arange(dc.size)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for n in range(start, maxIter):
+            if n >= orbit.size:
+                glitched[active] = True
+                break
+            Z = orbit[n]
+            z = Z + d
+            rSq = z.real*z.real + z.imag*z.imag
+            escaped = rSq > limit
+            glitch = rSq < GLITCH_TOLERANCE**2*(Z.real*Z.real + Z.imag*Z.imag)
+            glitch &= ~escaped
+            finished = escaped | glitch
+            if finished.any():
+                count[active[escaped]] = n
+                glitched[active[glitch]] = True
+                stay = ~finished
+                active = active[stay]
+                if active.size == 0:
+                    break
+                d, dc = d[stay], dc[stay]
+            d = (Z + Z + d)*d + dc
+        #end_for_n
+    return count, glitched
+
+def point(reference, dc, precision):
+    #The Decimal point at distance dc from reference
+    with localcontext() as context:
+        context.prec = precision
+        return reference[0] + Decimal(dc.real), reference[1] + Decimal(dc.imag)
+
+def deep_count(dc, reference, orbit, zReal, zImag, maxIter, limit, precision,
+               series=None, references=None):
+    #Escape count for points at distance dc (complex array) from the Decimal
+    #point reference, whose orbit is given. If series (from 
+    #series_approximation) is given, this starts from there.
+    #Glitched points are done again against the extra references in the 
+    #list references, (dcReference, orbit), left by earlier calls; then 
+    #against new ones (added to the list), up to MAX_REFERENCES; any left 
+    #after that by exact_count.
+    start, d = 0, None
+    if series is not None:
+        start, A, B, C = series
+        d = ((C*dc + B)*dc + A)*dc
+    count, glitched = perturbation_count(dc, orbit, maxIter, limit, start, d)
+    pending = np.flatnonzero(glitched)
+    references = [] if references is None else references
+    tried = made = 0
+    while pending.size > 0:
+        if tried < len(references):
+            dcReference, orbit = references[tried]
+        elif made < MAX_REFERENCES:
+            #The next reference is one of the glitched points
+            dcReference = dc[pending[pending.size//2]]
+            orbit = reference_orbit(*point(reference, dcReference, precision),
+                                    zReal, zImag, maxIter, limit, precision)
+            made += 1
+            if len(references) < MAX_KEPT:
+                references.append((dcReference, orbit))
+        else:
+            break
+        tried += 1
+        pendingCount, glitched = perturbation_count(dc[pending] - dcReference,
+                                                    orbit, maxIter, limit)
+        count[pending] = pendingCount
+        pending = pending[glitched]
+    #end_while
+    for n in pending:
+        count[n] = exact_count(*point(reference, dc[n], precision),
+                               zReal, zImag, maxIter, limit, precision)
+    #end_for_n
+    return count
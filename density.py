@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Density images, for the programs which plot points (feigenbaum, henon).
+Rather than just setting a pixel when a point falls on it, the number of hits
+on each pixel is counted in a "histogram" (a numpy array of integers, one per
+pixel). At the end it is tone-mapped to colours, so that often visited parts
+appear brighter.
+Histograms of the same size simply add up, so a long run can be split over
+several processes (or done in several goes) and the parts merged.
+Rev 1.0 - 18 Oct 26
+@author: Owner
+"""
+import numpy as np
+
+def new_histogram(ySize, xSize, base=None):
+    #A histogram for an image of the given size, starting with the counts
+    #in base (e.g. from an earlier run) if given
+    histogram = np.zeros((ySize, xSize), dtype=np.int64)
+    if base is not None:
+        histogram += check_shape(base, histogram.shape)
+    return histogram
+
+def check_shape(histogram, shape):
+    histogram = np.asarray(histogram)
+    if histogram.shape != tuple(shape):
+        raise ValueError("Histogram is {}, expected {}".format(
+                         histogram.shape, tuple(shape)))
+    return histogram
+
+def merge_histograms(histograms):
+    #The sum of a list of histograms, all of the same size
+    histograms = list(histograms)
+    merged = new_histogram(*np.shape(histograms[0]))
+    for histogram in histograms:
+        merged += check_shape(histogram, merged.shape)
+    #end_for_histogram
+    return merged
+
+def tone_map(histogram, colour, background=(0, 0, 0), toneMap="log",
+             gamma=0.5):
+    #Colours for a histogram: from background (no hits) to colour (most
+    #hits). toneMap "log": brightness log(1 + hits)/log(1 + most hits);
+    #"gamma": (hits/most hits)**gamma.
+    histogram = np.asarray(histogram)
+    most = histogram.max()
+    if most <= 0:
+        level = np.zeros(histogram.shape)
+    elif toneMap == "log":
+        level = np.log1p(histogram)/np.log1p(most)
+    elif toneMap == "gamma":
+        level = (histogram/most)**gamma
+    else:
+        raise ValueError("Unknown tone map: {}".format(toneMap))
+    colour = np.asarray(colour, dtype=np.float64)
+    background = np.asarray(background, dtype=np.float64)
+    image = background + level[..., np.newaxis]*(colour - background)
+    return np.rint(image).astype(np.uint8)
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """
 Created on Sun Dec 11 13:46:06 2022
-
+Rev 1.1 - 18 Oct 26
+    Adds choose_colours, for the vectorised traverse_k in feigenbaum.
 @author: Owner
 """
+import numpy as np
 
 from sys import path
 if not "../modules" in path:
@@ -22,6 +24,11 @@ class FeigColour(Feigenbaum):
 
     def choose_colour(self, i):
         return self.contourColours[i%len(self.contourColours)]
+
+    def choose_colours(self, i):
+        #As choose_colour, for an array of i
+        table = np.array(self.contourColours, dtype=np.uint8)
+        return table[i%len(self.contourColours)]
         
 #MAIN
 if __name__ == "__main__":
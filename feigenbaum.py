@@ -16,13 +16,87 @@ Rev 1.4 - 03 Jan 23
     FeigPtoFofP has correct text label in plot. Occasioned a quite large 
     reorganisation ...this needs further development actually: ¿a case for dual 
     inheritance?
+Rev 1.5 - 18 Oct 26
+    traverse_k is vectorised: p is iterated for all values of k at once, 
+    and the points are written to the image together at the end. Switch 
+    "vectorise". For this, subclasses give the point to plot for each 
+    iteration via plot_coords, and colours via choose_colours.
+    * Density mode (module density): the hits on each pixel are counted, and
+      the image shows the counts (log or gamma scale) in colour0. Switch 
+      "density", parameters "toneMap" and "gamma". A histogram from other
+      runs may be given to be added in ("histogram"), the result is kept in
+      self.histogram.
+    * Checkpoints (module checkpoint): "checkpoint" names a file to save the
+      state to when done (p for each k, the hits so far and the parameters);
+      "resume" a file to carry on from. maxIter remains the total, so a 
+      resumed run only does the iterations still missing (it may not be less
+      than the checkpoint's). Needs vectorise. A resumed histogram replaces 
+      "histogram".
+    * Adaptive sampling of k (switch "adaptive"): a quick first pass finds 
+      the period of p for each step of k (orbit_period). Where it changes, 
+      or none is found (chaos, or not yet settled), the step is sampled 
+      more finely, up to "kSamples" values of k in all (default 4*kRes), and
+      iterated "refineIter" times as long. Elsewhere one k per step is 
+      enough. Not with checkpoints.
+    * Analysis, over the same function (and its derivative, given by each 
+      class): analyse() gives the Lyapunov exponent and period of p for each 
+      k; bifurcation_points() the period-doubling points, by bisection on 
+      the multiplier of the q-cycle (found by Newton's method) being -1;
+      delta_estimates() Feigenbaum's constant from these; lyapunov_image()
+      a strip showing the Lyapunov exponent along k.
 @author: Owner
 """
 
-from math import sin, cos
+import numpy as np
+from numpy import ones, uint8, sin, cos
 from matplotlib.pyplot import rcParams, savefig, subplots, title, xlabel, ylabel
-from numpy import ones, uint8
 from PIL import Image
+from density import new_histogram, tone_map
+from checkpoint import save_checkpoint, load_checkpoint
+
+PERIOD_WINDOW = 64 #Iterations looked at to find a period (so up to 32)
+PERIOD_TOLERANCE = 1e-6 #Relative, for p to be taken to repeat
+MAX_REFINE = 64 #Most values of k in one step of an adaptive traverse
+ANALYSIS_POINTS = 2000 #Default values of k for analyse
+ANALYSIS_SETTLE = 1000 #Iterations before analysing p
+ANALYSIS_ITER = 2000 #Iterations averaged for the Lyapunov exponent
+NEWTON_STEPS = 8 #To find a q-cycle from a point near it
+BISECTION_STEPS = 60 #For a bifurcation point (to double precision)
+
+def orbit_period(tail, tolerance=PERIOD_TOLERANCE):
+    #The period of orbits from their last few points (tail: rows of 
+    #iterations, columns of orbits): the least q for which each point equals 
+    #the one q later. 0 if there is none (chaos, or not settled), -1 if the
+    #orbit overflowed.
+    period = np.zeros(tail.shape[1], dtype=np.int64)
+    with np.errstate(invalid="ignore"):
+        for q in range(1, len(tail)//2 + 1):
+            repeats = (np.abs(tail[q:] - tail[:-q])
+                       <= tolerance*(1 + np.abs(tail[q:]))).all(axis=0)
+            period[(period == 0) & repeats] = q
+        #end_for_q
+    period[~np.isfinite(tail).all(axis=0)] = -1
+    return period
+
+def cascade(points, periods):
+    #The first period-doubling cascade in points (bifurcation_points): the 
+    #first point where the least period found doubles, then the first after
+    #that where twice that period doubles, and so on
+    chosen = []
+    if len(points) > 0:
+        want = np.min(periods)
+        for point, q in sorted(zip(points, periods)):
+            if q == want:
+                chosen.append(point)
+                want *= 2
+        #end_for_point
+    return np.array(chosen)
+
+def feigenbaum_delta(points):
+    #Estimates of Feigenbaum's delta from successive period-doubling points 
+    #of a cascade: (b[n] - b[n-1])/(b[n+1] - b[n]), the last the best
+    b = np.asarray(points, dtype=np.float64)
+    return (b[1:-1] - b[:-2])/(b[2:] - b[1:-1])
 
 class Feigenbaum():
     title = "Feigenbaum: p := p + k*p*(1-p)"
@@ -38,6 +112,16 @@ class Feigenbaum():
         self.maxIter = kwargs.setdefault("maxIter", 40)
         self.colour0 = kwargs.setdefault("colour0", [0xFF, 0x00, 0xF0])
         self.colour1 = kwargs.setdefault("colour1", [0x00, 0xF0, 0xFF])
+        self.vectorise = kwargs.setdefault("vectorise", True)
+        self.density = kwargs.setdefault("density", False)
+        self.toneMap = kwargs.setdefault("toneMap", "log")
+        self.gamma = kwargs.setdefault("gamma", 0.5)
+        self.baseHistogram = kwargs.setdefault("histogram", None)
+        self.checkpoint = kwargs.setdefault("checkpoint", None)#file to save to
+        self.resume = kwargs.setdefault("resume", None)#file to carry on from
+        self.adaptive = kwargs.setdefault("adaptive", False)
+        self.kSamples = kwargs.setdefault("kSamples", None)#default 4*kRes
+        self.refineIter = kwargs.setdefault("refineIter", 1)
 
         self.SUCCESS = 1
         self.OVERFLOW = 2
@@ -118,13 +202,294 @@ class Feigenbaum():
         self.yIncr = self.yRange/self.ySize
         
     def traverse_k(self):
+        if not self.vectorise and (self.checkpoint or self.resume):
+            raise ValueError("Checkpoints need vectorise")
+        if self.adaptive and (self.checkpoint or self.resume):
+            raise ValueError("Checkpoints are not for adaptive sampling")
+        if self.density:
+            self.histogram = new_histogram(self.ySize, self.xSize, 
+                                           self.baseHistogram)
         #Determine increase per step
         kIncr = (self.kEnd - self.kStart)/self.kRes
-        k = self.kStart
-        for i in range(self.kRes):
-            self.iterate(k)
-            k += kIncr
-        #end_for_i
+        if self.vectorise:
+            self.traverse_k_array(kIncr)
+        else:
+            k = self.kStart
+            for i in range(self.kRes):
+                self.iterate(k)
+                k += kIncr
+            #end_for_i
+        if self.density:
+            self.myArray = tone_map(self.histogram, self.colour0, 
+                                    toneMap=self.toneMap, gamma=self.gamma)
+
+    def traverse_k_array(self, kIncr):
+        #As traverse_k, but iterate for all values of k at once. The image is
+        #the same: where a pixel is hit more than once, the last hit (in the 
+        #order k, then i) decides its colour. The last hit on each pixel is
+        #kept as (which k)*span + i, and the image coloured at the end.
+        #If adaptive, refined values of k are iterated span (refineIter times
+        #maxIter) times, plotting after ignore*refineIter.
+        span = self.maxIter*(self.refineIter if self.adaptive else 1)
+        if self.adaptive:
+            k, refined = self.adaptive_k(kIncr)
+        else:
+            #k as from repeated k += kIncr
+            k = np.add.accumulate(np.r_[self.kStart, 
+                                        np.full(self.kRes - 1, kIncr)])
+            refined = np.zeros(self.kRes, dtype=bool)
+        p = np.full(k.size, self.p0, dtype=np.float64)
+        order = np.arange(k.size)*span
+        settle = np.where(refined, self.ignore*self.refineIter, self.ignore)
+        lastHit = np.full(self.ySize*self.xSize, -1, dtype=np.int64)
+        first = 0
+        if self.resume is not None:
+            first, k, p, order, lastHit = self.load_state(self.resume)
+            #(k without those which overflowed before; never refined)
+            settle = np.full(k.size, self.ignore)
+            refined = np.zeros(k.size, dtype=bool)
+        with np.errstate(over="ignore", invalid="ignore"):
+            for i in range(first, span):
+                if i == self.maxIter and span > self.maxIter:
+                    #Only refined values of k go further
+                    k, p, order, settle, refined = [
+                        a[refined] for a in (k, p, order, settle, refined)]
+                fp = self.function(p, k)
+                if i >= self.ignore:
+                    x, y = self.plot_coords(k, p, fp)
+                    xPixel = np.trunc((x - self.xMin)/self.xIncr)
+                    yPixel = np.trunc((y - self.yMin)/self.yIncr)
+                    inside = (xPixel > -1) & (xPixel < self.xSize) \
+                             & (yPixel > -1) & (yPixel < self.ySize) \
+                             & (i >= settle)
+                    pixel = (self.ySize - 1 - yPixel[inside])*self.xSize \
+                            + xPixel[inside]
+                    if self.density:
+                        np.add.at(self.histogram.reshape(-1), 
+                                  pixel.astype(np.int64), 1)
+                    else:
+                        np.maximum.at(lastHit, pixel.astype(np.int64), 
+                                      order[inside] + i)
+                #Points which overflowed go no further
+                finite = np.isfinite(fp)
+                if not finite.all():
+                    k, fp, order, settle, refined = [
+                        a[finite] for a in (k, fp, order, settle, refined)]
+                p = fp
+            #end_for_i
+        if self.checkpoint is not None:
+            self.save_state(self.checkpoint, max(first, self.maxIter), k, p, 
+                            order, lastHit)
+        hit = np.flatnonzero(lastHit >= 0)
+        self.myArray.reshape(-1, 3)[hit] = \
+            self.choose_colours(lastHit[hit] % span)
+
+    def adaptive_k(self, kIncr):
+        #The values of k for an adaptive traverse: one for each step of 
+        #kIncr, and more (evenly across the step) where the period changes 
+        #from one step to the next or none is found, up to kSamples in all. 
+        #Returns k, and which values are in refined steps.
+        k = np.add.accumulate(np.r_[self.kStart, 
+                                    np.full(self.kRes - 1, kIncr)])
+        period = self.k_periods(k)
+        change = period == 0
+        change[1:] |= period[1:] != period[:-1]
+        change[:-1] |= period[:-1] != period[1:]
+        kSamples = 4*self.kRes if self.kSamples is None else self.kSamples
+        refine = np.ones(k.size, dtype=np.int64)
+        if change.any():
+            extra = max(0, kSamples - k.size)//np.count_nonzero(change)
+            refine[change] = min(MAX_REFINE, 1 + extra)
+        #Position of each new k within its step
+        j = np.arange(refine.sum()) - np.repeat(np.cumsum(refine) - refine, 
+                                                refine)
+        k = np.repeat(k, refine) + j*np.repeat(kIncr/refine, refine)
+        return k, np.repeat(change, refine)
+
+    def k_periods(self, k, iterations=None):
+        #The period of p for each k after iterations (default maxIter), see
+        #orbit_period
+        iterations = self.maxIter if iterations is None else iterations
+        p = np.full(np.shape(k), self.p0, dtype=np.float64)
+        tail = np.empty((PERIOD_WINDOW,) + np.shape(k))
+        with np.errstate(over="ignore", invalid="ignore"):
+            for i in range(iterations):
+                p = self.function(p, k)
+            #end_for_i
+            for i in range(PERIOD_WINDOW):
+                p = self.function(p, k)
+                tail[i] = p
+            #end_for_i
+        return orbit_period(tail)
+
+    def plot_coords(self, k, p, fp):
+        #The point to plot: (x, y) for p (which gives fp) and k
+        return k, fp
+
+    def analyse(self, k=None, settle=ANALYSIS_SETTLE, iterations=ANALYSIS_ITER):
+        #For each k (default ANALYSIS_POINTS from kStart to kEnd), after 
+        #settle iterations: the Lyapunov exponent, the mean of log|f'(p)| over
+        #iterations, and the period (orbit_period). Returns k, lyapunov, 
+        #period.
+        if k is None:
+            k = np.linspace(self.kStart, self.kEnd, ANALYSIS_POINTS, 
+                            endpoint=False)
+        k = np.asarray(k, dtype=np.float64)
+        p = np.full(k.shape, self.p0, dtype=np.float64)
+        total = np.zeros(k.shape)
+        window = min(PERIOD_WINDOW, iterations)
+        tail = np.empty((window,) + k.shape)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            for i in range(settle):
+                p = self.function(p, k)
+            #end_for_i
+            for i in range(iterations):
+                total += np.log(np.abs(self.derivative(p, k)))
+                p = self.function(p, k)
+                if i >= iterations - window:
+                    tail[i - iterations + window] = p
+            #end_for_i
+        return k, total/iterations, orbit_period(tail)
+
+    def bifurcation_points(self, k=None, settle=ANALYSIS_SETTLE, 
+                           iterations=ANALYSIS_ITER):
+        #The period-doubling points: from one value of k to the next (as 
+        #analyse) with a period found, q becomes 2q. Each is then found by 
+        #bisection on doubling_test. Returns the points, and q for each.
+        k, lyapunov, period = self.analyse(k, settle, iterations)
+        found = np.flatnonzero(period > 0)
+        before, after = found[:-1], found[1:]
+        doubles = period[after] == 2*period[before]
+        before, after = before[doubles], after[doubles]
+        low, q = k[before], period[before]
+        #p settles slowly near a bifurcation, so 2q may be seen too soon: 
+        #look further on (1, 2, 4 ... values of k) for the test to be < 0
+        high = np.full(low.shape, np.nan)
+        step = 1
+        while step < k.size:
+            index = np.minimum(after + step - 1, k.size - 1)
+            look = np.flatnonzero(np.isnan(high) & (period[index] == 2*q))
+            beyond = self.doubling_test(k[index[look]], q[look], settle) < 0
+            high[look[beyond]] = k[index[look[beyond]]]
+            step *= 2
+        #end_while
+        sign = ~np.isnan(high) & (self.doubling_test(low, q, settle) > 0)
+        low, high, q = low[sign], high[sign], q[sign]
+        for n in range(BISECTION_STEPS):
+            middle = (low + high)/2
+            beyond = self.doubling_test(middle, q, settle) < 0
+            high = np.where(beyond, middle, high)
+            low = np.where(beyond, low, middle)
+        #end_for_n
+        return (low + high)/2, q
+
+    def doubling_test(self, k, q, settle=ANALYSIS_SETTLE):
+        #1 + the multiplier of the q-cycle (for each k and q), starting from 
+        #p after settle: > 0 while the cycle is stable, < 0 once it has 
+        #doubled
+        p = np.full(np.shape(k), self.p0, dtype=np.float64)
+        with np.errstate(over="ignore", invalid="ignore"):
+            for i in range(settle):
+                p = self.function(p, k)
+            #end_for_i
+        return self.cycle_multiplier(k, q, p) + 1
+
+    def cycle_multiplier(self, k, q, p):
+        #The derivative of f^q at the q-cycle near p, found by Newton's 
+        #method on f^q(p) - p
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            for n in range(NEWTON_STEPS):
+                fq, dfq = self.compose(p, k, q)
+                step = (fq - p)/(dfq - 1)
+                p = np.where(np.isfinite(step), p - step, p)
+            #end_for_n
+            return self.compose(p, k, q)[1]
+
+    def compose(self, p, k, q):
+        #f^q(p) and its derivative, for each p, k and q
+        dfq = np.ones(np.shape(p))
+        for j in range(int(np.max(q, initial=0))):
+            going = j < q
+            dfq = np.where(going, dfq*self.derivative(p, k), dfq)
+            p = np.where(going, self.function(p, k), p)
+        #end_for_j
+        return p, dfq
+
+    def delta_estimates(self, k=None, settle=ANALYSIS_SETTLE,
+                        iterations=ANALYSIS_ITER):
+        #Estimates of Feigenbaum's delta (feigenbaum_delta) from the first 
+        #cascade of bifurcation_points. Returns the estimates, and the points.
+        points = cascade(*self.bifurcation_points(k, settle, iterations))
+        return feigenbaum_delta(points), points
+
+    def lyapunov_image(self, **kwargs):
+        #A strip showing the Lyapunov exponent for each k (as a column, from 
+        #kStart to kEnd): colour0 where negative (periodic), colour1 where 
+        #positive (chaos), brighter the larger it is. Near 0 (at bifurcations)
+        #is dark.
+        self.xSize = kwargs.setdefault("xSize", 800)
+        self.ySize = kwargs.setdefault("ySize", 60)
+        self.fname = kwargs.setdefault("fname", "../images/templimage.png")
+        self.saveImage = kwargs.setdefault("saveImage", False)
+
+        kIncr = (self.kEnd - self.kStart)/self.xSize
+        k = self.kStart + np.arange(self.xSize)*kIncr
+        k, self.lyapunov, self.period = self.analyse(k)
+        finite = np.isfinite(self.lyapunov)
+        scale = np.abs(self.lyapunov[finite]).max(initial=0) or 1
+        #(-inf, at a superstable k, is brightest; overflow, nan, is black)
+        level = np.where(np.isnan(self.lyapunov), 0, 
+                         np.minimum(1, np.abs(self.lyapunov)/scale))
+        colour = np.where((self.lyapunov < 0)[:, np.newaxis], 
+                          np.array(self.colour0, dtype=np.float64),
+                          np.array(self.colour1, dtype=np.float64))
+        strip = np.rint(level[:, np.newaxis]*colour).astype(uint8)
+        self.myArray = np.repeat(strip[np.newaxis], self.ySize, axis=0)
+
+        #Display the result using PIL
+        im = Image.fromarray(self.myArray)
+        im.show()
+        if self.saveImage == True:
+            try:
+                im.save(self.fname, format="PNG")
+            except:
+                print("Couldn't save file", self.fname)
+
+    def parameters(self):
+        #What a checkpoint must agree with, to be carried on from
+        return {"class": type(self).__name__, "kStart": self.kStart,
+                "kEnd": self.kEnd, "kRes": self.kRes, "p0": self.p0,
+                "ignore": self.ignore, 
+                "range": [self.xMin, self.xMax, self.yMin, self.yMax],
+                "size": [self.xSize, self.ySize], "density": self.density}
+
+    def save_state(self, fname, iterations, k, p, order, lastHit):
+        #Checkpoint for traverse_k_array: p for each k (still finite) after 
+        #iterations, and the hits so far. order and lastHit are saved as 
+        #(which k) and i, as they depend on maxIter.
+        hits = {"histogram": self.histogram} if self.density else \
+               {"hitK": np.where(lastHit >= 0, lastHit//self.maxIter, -1),
+                "hitI": np.where(lastHit >= 0, lastHit%self.maxIter, -1)}
+        save_checkpoint(fname, self.parameters(), iterations=iterations, k=k,
+                        p=p, kIndex=order//self.maxIter, **hits)
+
+    def load_state(self, fname):
+        #Carry on from a checkpoint (save_state). Returns iterations, k, p, 
+        #order and lastHit as used in traverse_k_array.
+        state = load_checkpoint(fname, self.parameters())
+        #(hitI must stay below maxIter, for the order of the hits)
+        if int(state["iterations"]) > self.maxIter:
+            raise ValueError("Checkpoint is of " + str(state["iterations"])
+                             + " iterations, more than maxIter")
+        lastHit = np.full(self.ySize*self.xSize, -1, dtype=np.int64)
+        if self.density:
+            self.histogram = new_histogram(self.ySize, self.xSize, 
+                                           state["histogram"])
+        else:
+            hitK, hitI = state["hitK"], state["hitI"]
+            lastHit = np.where(hitK >= 0, hitK*self.maxIter + hitI, -1)
+        return (int(state["iterations"]), state["k"], state["p"], 
+                state["kIndex"]*self.maxIter, lastHit)
 
     def iterate(self, k):
         p = self.p0
@@ -135,8 +500,7 @@ class Feigenbaum():
             #set pixel for this p
             retcode, xPixel, yPixel= self.get_pixel(k, p)
             if retcode == self.SUCCESS:
-                self.myArray[self.ySize-1-yPixel, xPixel]\
-                             = self.choose_colour(i)
+                self.plot_pixel(self.ySize-1-yPixel, xPixel, i)
             elif retcode == self.OVERFLOW:
                 break
         #end_for_i
@@ -154,15 +518,32 @@ class Feigenbaum():
         else:
             return self.OUTOFBOUNDS, None, None
 
+    def plot_pixel(self, row, column, i):
+        if self.density:
+            self.histogram[row, column] += 1
+        else:
+            self.myArray[row, column] = self.choose_colour(i)
+
     def choose_colour(self, i):
             if i % 2 == 0:
                 return self.colour0
             else:
                 return self.colour1
 
+    def choose_colours(self, i):
+        #As choose_colour, for an array of i
+        return np.where((i % 2 == 0)[:, np.newaxis], 
+                        np.array(self.colour0, dtype=uint8), 
+                        np.array(self.colour1, dtype=uint8))
+
 
     def function(self, p, k):
         return p + k*p*(1-p)
+
+    def derivative(self, p, k):
+        #d(function)/dp, for the analysis. A subclass with another function
+        #must override this.
+        return 1 + k*(1 - 2*p)
     
 
 class Feig2(Feigenbaum):
@@ -171,12 +552,18 @@ class Feig2(Feigenbaum):
     def function(self, p, k):
         return k*p*p*(1-p)
 
+    def derivative(self, p, k):
+        return k*p*(2 - 3*p)
+
 
 class Feig3(Feigenbaum):
     title = "Feigenbaum: p := k*sin(p)*cos(p)"
 
     def function(self, p, k):
         return k*sin(p)*(cos(p))
+
+    def derivative(self, p, k):
+        return k*cos(2*p)
     
     
 class FeigPtoFofP(Feigenbaum):
@@ -255,14 +642,16 @@ class FeigPtoFofP(Feigenbaum):
             #set pixel for this p
             retcode, xPixel, yPixel= self.get_pixel(p, fp)
             if retcode == self.SUCCESS:
-                self.myArray[self.ySize-1-yPixel, xPixel]\
-                             = self.choose_colour(i)
+                self.plot_pixel(self.ySize-1-yPixel, xPixel, i)
             elif retcode == self.OVERFLOW:
                 break
             #(else p is out of display bounds)
             p = fp
         #end_for_i
 
+    def plot_coords(self, k, p, fp):
+        return p, fp
+
         
 if __name__=="__main__":
     tc = 5
@@ -287,4 +676,10 @@ if __name__=="__main__":
     if tc==5:
         f=FeigPtoFofP(kStart=0, kEnd=3, ignore=50, maxIter=100)
         f.plot(kRes=200)
-        f.image()
\ No newline at end of file
+        f.image()
+    if tc==6:
+        f=Feigenbaum()
+        delta, points = f.delta_estimates(np.linspace(1.9, 2.58, 40000))
+        print("Bifurcations:", points)
+        print("Feigenbaum delta:", delta)
+        f.lyapunov_image()
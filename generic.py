@@ -49,6 +49,52 @@ Rev 3.2 - 13 Jan 23
       attraction or iteration contours.
 Rev 3.3 - 10 Mar 23
     * Removed the contour colouring mechanism introduced in R2.4.
+Rev 3.4 - 18 Oct 26
+    * Vectorised traverse_array: where a class provides iterate_array the 
+      whole grid is iterated at once using numpy (see module kernels). 
+      Julia, Mandelbrot, Mandelbar and Burning do so. Switch "vectorise".
+    * Optionally renders in horizontal bands using a pool of processes, 
+      which write directly to shared memory. Parameter "processes".
+    * Can be used without the GUI (master=None), see render(). Parameter 
+      "contours" sets the number of contours, as via the "More" button. 
+      The program batch.py uses this to render a list of images.
+    * The vectorised iterations store their result per pixel (iterations, 
+      root found, in set?) in self.result, separately from the colours. The 
+      "Recolour" button then re-colours the image without iterating again.
+      NCubeRoot1 and NComplexRoot are now vectorised too.
+    * Mandelbrot: points in the main cardioid and period-2 bulb are coloured 
+      without iterating, unless the seed is not zero. Switch "interiorCheck".
+    * Julia, Mandelbrot (etc.): orbits which become periodic are recognised 
+      as being in the set (Brent's method). Parameter "periodTolerance", set 
+      to 0 to switch this off.
+    * Optional Mariani-Silver subdivision for vectorised iterations: only 
+      the edges of rectangles are computed, a rectangle is filled if its 
+      edge is all the same. Switch "subdivide", off by default: it only 
+      pays where pixels are costly (high maxIter, periodTolerance 0) and 
+      the image has large areas of one colour.
+    * Progressive display in the GUI window: the image is computed at 1/8, 
+      1/4, 1/2 and then full resolution, each pass re-using the pixels 
+      already computed. The "Stop" button cancels. Switch "progressive".
+    * The image is computed in a separate thread, so the GUI stays alive. 
+      There is a progress bar, and "Stop" cancels any render.
+    * Mandelbrot: deep zoom by perturbation (module deepzoom) for views too 
+      narrow for float64, switch "deepZoom". The ranges are then held as 
+      Decimal and may be entered to any number of digits.
+    * Deep zoom skips the first iterations by series approximation, where 
+      this is accurate at the corners of the view. Switch "seriesApprox".
+      (Checked also at the centre and the edge midpoints.)
+    * NComplexRoot uses the Newton kernel in module kernels (shared with 
+      riemann.NRComplexRoot), the root is found by rounding the angle.
+    * Adds class NPolynomial, Newton's method for any polynomial (given by 
+      its coefficients).
+    * NCubeRoot1 uses the Newton kernel in module kernels (shared with 
+      newton_cr_one.py).
+    * MbrotRealPower and MagModel1 use compiled kernels if numba is 
+      installed, otherwise (or with vectorise=False) ComplexVar as before.
+    * prepare_render() is called before any bands are iterated; Mandelbrot
+      uses it to compute the deep zoom reference orbit once per render 
+      (worker processes are given it). Extra references made for glitches
+      are kept for the other bands.
       
 @author: Owner
 (Many thanks to Karl-Heinz Becker and Michael Doerffler)
@@ -58,18 +104,58 @@ if not "../modules" in path:
     path.append('../modules')
 import numpy as np
 from datetime import datetime
+from multiprocessing import RawArray, get_context
+from queue import Queue
+from threading import Event, Thread
 from tkinter import Tk, Frame, Label, StringVar, Entry, Button, E, W
-from PIL import Image
+from tkinter import Misc, Variable
+from tkinter.ttk import Progressbar
+from PIL import Image, ImageTk
 from math import pi
 import myColour
 from myMathOO import ComplexVar
+from kernels import escape_count, in_main_bulbs
+from kernels import newton_roots_of_one, newton_polynomial, root_table, horner
+from kernels import newton_cube_roots
+from kernels import JIT, compiled_count, real_power_count, magnet1_count
+from decimal import Decimal, localcontext
+from deepzoom import reference_orbit, series_approximation, deep_count, \
+                     probe_points
+#
+# The result of an iteration for each pixel: number of iterations, root found 
+# (if relevant, 0 if none) and whether the pixel is "in the set"
+#
+RESULT_TYPE = np.dtype([("count", np.int32), ("root", np.int16), 
+                        ("inSet", np.bool_)])
+#
+# Worker processes for GenIteration.render_tiles
+#
+tileWorker = {}
+
+def init_tile_worker(iteration, sharedArray, sharedResult, shape):
+    #Runs once in each worker: the iteration object and views onto the 
+    #shared image and result arrays are kept for the bands to come
+    tileWorker["iteration"] = iteration
+    tileWorker["array"] = np.frombuffer(sharedArray, 
+                                        dtype=np.uint8).reshape(shape)
+    tileWorker["result"] = np.frombuffer(sharedResult, 
+                                         dtype=RESULT_TYPE).reshape(shape[:2])
+
+def render_tile(band):
+    row0, row1, x, y = band
+    vectorised = tileWorker["iteration"].traverse_array(
+                     tileWorker["array"][row0:row1], x, y, 
+                     tileWorker["result"][row0:row1])
+    return row1 - row0, vectorised
+
 #
 # Iterate ??
 #
 class GenIteration():
     title = "Generic"
+    IMAGE_BUFFERS = ("iArray", "result") #per image, not copied to workers
     
-    def __init__(self, master, **kwargs):
+    def __init__(self, master=None, **kwargs):
         self.seed = kwargs.setdefault("seed", [0, 0])
         self.setColour = kwargs.setdefault("setColour", [0xD0,0xFF,0xFF])
         self.infColour = kwargs.setdefault("infColour", [0x00,0x00,0x00])
@@ -84,12 +170,14 @@ class GenIteration():
         self.saveImage = kwargs.setdefault("saveImage", False)
         self.fname = kwargs.setdefault("fname", "../images/tempgimage.png")
         self.showImage = kwargs.setdefault("showImage", True)
+        self.vectorise = kwargs.setdefault("vectorise", True)
+        self.processes = kwargs.setdefault("processes", 1)
+        self.subdivide = kwargs.setdefault("subdivide", False)
+        self.progressive = kwargs.setdefault("progressive", True)
+        self.contours = kwargs.setdefault("contours", None)
         
-        if self.xEnd < self.xStart:
-            self.xStart, self.xEnd = self.xEnd, self.xStart
-        self.yEnd = self.yStart + \
-                     (self.xEnd - self.xStart) * self.imageRatio
         self.ySize = int(self.xSize * self.imageRatio)
+        self.set_range(self.xStart, self.xEnd, self.yStart)
         print("Size =", self.xSize, "x", self.ySize)
         
         self.xSeed = self.seed[0]
@@ -102,12 +190,13 @@ class GenIteration():
             self.palette = ""
         self.contourColours = myColour.get_palette(self.palette)
         self.contourInputActive = False
+        self.resultValid = False
+        self.rendering = False
 
         self.ABSURD_ITER = 10000
-
-
-        self.master = master
-        master.title(self.title)
+        self.PASS_PIXELS = 65536 #Pixels per step in progressive passes
+        self.SUBDIVIDE_FILL = 0.1 #see subdivide_array
+        self.POLL_TIME = 50 #ms, GUI checks on render thread
 
         self.MESSAGES = ["Ready",
                          "Please enter iterations: ",
@@ -115,7 +204,9 @@ class GenIteration():
                          "Look out kid, it's something you did",
                          "Please enter nr. of contours",
                          "Please enter hex value for colour",
-                         "Please enter seed value"]
+                         "Please enter seed value",
+                         "Stopped",
+                         "Preview 1/{}"]
 
         self.LABELS =  ["Iterations: ",
                         "Range x: ",
@@ -125,6 +216,15 @@ class GenIteration():
                         "Seed x",
                         "Seed y"]
 
+        self.master = master
+        if master is None:
+            #No GUI: use render()
+            self.contourInputActive = self.contours is not None
+            return
+        master.title(self.title)
+        self.renderQueue = Queue()
+        self.cancelEvent = Event()
+
         self.frame = Frame(master)
         self.frame.grid()
 
@@ -135,6 +235,9 @@ class GenIteration():
         self.mLabel = Label(self.frame, textvariable=self.messageText)
         self.mLabel.grid(row=self.currentRow, column=self.currentColumn, 
                           columnspan=5, sticky=W)
+        self.progressBar = Progressbar(self.frame, maximum=100)
+        self.progressBar.grid(row=self.currentRow, column=5, columnspan=5,
+                              sticky=W+E)
 
         self.currentRow += 1
         self.iLabelText = StringVar()
@@ -159,13 +262,13 @@ class GenIteration():
         self.currentColumn += 1
         self.xStartText = StringVar()
         self.xEntry1 = Entry(self.frame, textvariable=self.xStartText, width=10)
-        self.xEntry1.insert(0, str(self.xStart))
+        self.xEntry1.insert(0, self.range_text()[0])
         self.xEntry1.grid(row=self.currentRow, column=self.currentColumn)
 
         self.currentColumn += 1
         self.xEndText = StringVar()
         self.xEntry2 = Entry(self.frame, textvariable=self.xEndText, width=10)
-        self.xEntry2.insert(0, str(self.xEnd))
+        self.xEntry2.insert(0, self.range_text()[1])
         self.xEntry2.grid(row=self.currentRow, column=self.currentColumn)
 
         self.currentColumn += 1
@@ -177,13 +280,13 @@ class GenIteration():
         self.currentColumn += 1
         self.yStartText = StringVar()
         self.yEntry1 = Entry(self.frame, textvariable=self.yStartText, width=10)
-        self.yEntry1.insert(0, str(self.yStart))
+        self.yEntry1.insert(0, self.range_text()[2])
         self.yEntry1.grid(row=self.currentRow, column=self.currentColumn)
 
         self.currentColumn += 1
         self.yEndText = StringVar()
         self.yEntry2 = Entry(self.frame, textvariable=self.yEndText, width=10)
-        self.yEntry2.insert(0, str(self.yEnd))
+        self.yEntry2.insert(0, self.range_text()[3])
         self.yEntry2.grid(row=self.currentRow, column=self.currentColumn)
 
         self.currentColumn += 1
@@ -201,21 +304,50 @@ class GenIteration():
                                  width=6, command=self.create_image)
         self.runButton.grid(row=self.currentRow, column=self.currentColumn)
 
+        self.currentColumn += 1
+        self.stopButton = Button(self.frame, text="Stop", \
+                                 width=6, command=self.stop, state="disable")
+        self.stopButton.grid(row=self.currentRow, column=self.currentColumn)
+
+        #For the image, below the controls
+        self.picture = Label(master)
+        self.picture.grid(row=1, column=0)
+
+        if self.contours is not None:
+            self.more_input()
+
     def auto_y(self):
         #Set the end value for y, according to defined ratio
         try:
-            self.xStart = float(self.xStartText.get())
-            self.xEnd = float(self.xEndText.get())
-            if self.xEnd < self.xStart:
-                self.xStart, self.xEnd = self.xEnd, self.xStart
-            self.yStart = float(self.yStartText.get())
-            self.yEnd = self.yStart + \
-                         (self.xEnd - self.xStart) * self.imageRatio
+            self.set_range(self.xStartText.get(), self.xEndText.get(),
+                           self.yStartText.get())
             self.yEntry2.delete(0,"end")
-            self.yEntry2.insert(0, str(self.yEnd))
-        except ValueError:
+            self.yEntry2.insert(0, self.range_text()[3])
+        except (ValueError, ArithmeticError):
             self.messageText.set(self.MESSAGES[2])
 
+    def set_range(self, xStart, xEnd, yStart, yEnd=None):
+        #Set the ranges for x and y (numbers or text). If yEnd is not given
+        #it is set according to defined ratio.
+        self.xStart = self.to_number(xStart)
+        self.xEnd = self.to_number(xEnd)
+        if self.xEnd < self.xStart:
+            self.xStart, self.xEnd = self.xEnd, self.xStart
+        self.yStart = self.to_number(yStart)
+        if yEnd is None:
+            self.yEnd = self.yStart + (self.xEnd - self.xStart) \
+                                      * self.to_number(self.imageRatio)
+        else:
+            self.yEnd = self.to_number(yEnd)
+
+    def range_text(self):
+        #xStart, xEnd, yStart, yEnd as shown in the GUI
+        return [str(self.xStart), str(self.xEnd),
+                str(self.yStart), str(self.yEnd)]
+
+    def to_number(self, value):
+        return float(value)
+
     def more_input(self):
         #The assumption is that the user now wants contours to be shown.
         #Adjustments to how they are displayed are made possible below.
@@ -235,7 +367,10 @@ class GenIteration():
         self.contourText = StringVar()
         self.contEntry = Entry(self.frame, textvariable=self.contourText, 
                                 width=4)
-        self.contEntry.insert(0, str(self.maxIter))
+        if self.contours is None:
+            self.contEntry.insert(0, str(self.maxIter))
+        else:
+            self.contEntry.insert(0, str(self.contours))
         self.contEntry.grid(row=self.currentRow, column=self.currentColumn,
                             sticky=W)
 
@@ -308,6 +443,12 @@ class GenIteration():
         self.cont2Entry = Entry(self.frame, textvariable=self.cont2Text, 
                                 width=6)
         self.cont2Entry.grid(row=self.currentRow, column=self.currentColumn)
+
+        self.currentColumn += 1
+        self.recolourButton = Button(self.frame, text="Recolour", \
+                                     width=8, command=self.recolour_image)
+        self.recolourButton.grid(row=self.currentRow, 
+                                 column=self.currentColumn)
                 
         #New row adds entries for seed value
         self.seedInputActive = True
@@ -412,7 +553,58 @@ class GenIteration():
                 colour = self.contourColours[i%len(self.contourColours)]
         return colour
 
+    def get_contour_colours(self, i):
+        #As get_contour_colour, for an array of values i
+        colours = np.empty(np.shape(i) + (3,), dtype=np.uint8)
+        colours[:] = self.infColour
+        if self.contourInputActive == True:
+            contour = i > self.contourStart
+            palette = np.array(self.contourColours, dtype=np.uint8)
+            colours[contour] = palette[i[contour]%len(palette)]
+        return colours
+
+    def colour_result(self, result):
+        #Colours for an array of results (see RESULT_TYPE). A table holds 
+        #the colour for each index value, with the set colour at the end.
+        index = self.colour_index(result)
+        nColours = max(int(index.max(initial=0)) + 1, 1)
+        table = np.empty((nColours + 1, 3), dtype=np.uint8)
+        table[:nColours] = self.get_contour_colours(np.arange(nColours))
+        table[nColours] = self.setColour
+        index = np.where(result["inSet"], nColours, index)
+        return table.take(index, axis=0)
+
+    def colour_index(self, result):
+        #Which part of the result decides the contour colour
+        return result["count"]
+
+    def recolour(self):
+        #Colour the image afresh from the stored results, without iterating.
+        #Returns the image array.
+        self.iArray[:] = self.colour_result(self.result)
+        return self.iArray
+
+    def recolour_image(self):
+        #GUI: as create_image, but only the colours have changed
+        if self.rendering:
+            return
+        if not self.resultValid:
+            self.create_image()
+            return
+        try:
+            self.contourStart = self.maxIter - int(self.contourText.get()) - 1
+        except ValueError:
+            self.messageText.set(self.MESSAGES[4])
+            return
+        startTime = datetime.now()
+        self.recolour()
+        self.show_picture(self.iArray)
+        self.output_image()
+        print("Recolour time =", datetime.now() - startTime)
+
     def create_image(self):        
+        if self.rendering:
+            return
         while True:
             #Read input values
             try:
@@ -424,11 +616,9 @@ class GenIteration():
                 self.messageText.set(self.MESSAGES[1])
                 return
             try:
-                self.xStart = float(self.xStartText.get())
-                self.xEnd = float(self.xEndText.get())
-                self.yStart = float(self.yStartText.get())
-                self.yEnd = float(self.yEndText.get())
-            except ValueError:
+                self.set_range(self.xStartText.get(), self.xEndText.get(),
+                               self.yStartText.get(), self.yEndText.get())
+            except (ValueError, ArithmeticError):
                 self.messageText.set(self.MESSAGES[2])
                 return
             try:
@@ -450,50 +640,388 @@ class GenIteration():
             break
 
         self.runButton["state"] = "disable"
-        startTime = datetime.now()
-        print(startTime.time(), "- Iterating...", self.maxIter)
-        print("x start", self.xStart, ": x end", self.xEnd)
-        print("y start", self.yStart, ": y end", self.yEnd)
-
-
+        self.stopButton["state"] = "active"
+        self.progressBar["value"] = 0
+        self.rendering = True
+        self.startTime = datetime.now()
+        print(self.startTime.time(), "- Iterating...", self.maxIter)
+        rangeText = self.range_text()
+        print("x start", rangeText[0], ": x end", rangeText[1])
+        print("y start", rangeText[2], ": y end", rangeText[3])
+
+        #The work is done by another thread, the GUI is kept informed via 
+        #renderQueue (see poll_queue)
+        self.cancelEvent.clear()
+        Thread(target=self.render_thread, daemon=True).start()
+        self.master.after(self.POLL_TIME, self.poll_queue)
+
+    def render_thread(self):
+        #Runs in its own thread, started by create_image
+        finished = None
+        try:
+            if self.progressive and not self.subdivide \
+               and self.processes == 1:
+                finished = self.progressive_array()
+            if finished is None:
+                finished = self.compute_array()
+        finally:
+            self.renderQueue.put(("done", finished, None, None))
+
+    def poll_queue(self):
+        #GUI: deal with the messages from the render thread
+        while not self.renderQueue.empty():
+            kind, value, preview, step = self.renderQueue.get()
+            if kind == "done":
+                self.finish_image(value)
+                return
+            self.progressBar["value"] = 100*value
+            if preview is not None:
+                self.show_picture(preview)
+                self.messageText.set(self.MESSAGES[8].format(step))
+        self.master.after(self.POLL_TIME, self.poll_queue)
+
+    def finish_image(self, finished):
+        #GUI: the render thread has stopped
+        if finished:
+            self.show_picture(self.iArray)
+            self.output_image()
+            self.messageText.set(self.MESSAGES[0])
+        else:
+            self.messageText.set(self.MESSAGES[7])
+        print("Runtime =", datetime.now() - self.startTime)
+        self.rendering = False
+        self.runButton["state"] = "active"
+        self.stopButton["state"] = "disable"
+
+    def stop(self):
+        self.cancelEvent.set()
+
+    def progress(self, fraction, preview=None, step=None):
+        #Called as the image is computed, with the fraction done (and perhaps
+        #a preview image). With the GUI, this is passed on via renderQueue. 
+        #Returns False if the computation is to stop.
+        if self.master is None:
+            return True
+        self.renderQueue.put(("progress", fraction, preview, step))
+        return not self.cancelEvent.is_set()
+
+    def show_picture(self, array):
+        #Show the image in the GUI window
+        self.photo = ImageTk.PhotoImage(Image.fromarray(array))
+        self.picture.config(image=self.photo)
+
+    def progressive_array(self):
+        #As compute_array, but in passes of increasing resolution (every 8th,
+        #4th, 2nd pixel, then all). Each pass only computes the pixels not 
+        #already done, and is passed on as a preview (see progress).
+        #Returns True if finished, False if stopped, None if the iteration 
+        #is not vectorised.
+        self.prepare_render()
+        x, y = self.image_planes()
         self.iArray = np.ones((self.ySize, self.xSize, 3), dtype=np.uint8)
-
-        self.traverse_array(self.iArray, self.xStart, self.xEnd, 
-                            self.yStart, self.yEnd, self.xSize, self.ySize)
-
+        self.result = np.zeros((self.ySize, self.xSize), dtype=RESULT_TYPE)
+        self.resultValid = False
+        rows, columns = np.indices((self.ySize, self.xSize))
+        computed = np.zeros((self.ySize, self.xSize), dtype=bool)
+        nDone = 0
+        for step in (8, 4, 2, 1):
+            new = (rows%step == 0) & (columns%step == 0) & ~computed
+            newRows, newColumns = rows[new], columns[new]
+            for n in range(0, newRows.size, self.PASS_PIXELS):
+                r = newRows[n:n + self.PASS_PIXELS]
+                c = newColumns[n:n + self.PASS_PIXELS]
+                pixels = self.iterate_array(self.xSeed, self.ySeed, 
+                                            x[0, c], y[r, 0],
+                                            self.maxIter, self.limit)
+                if pixels is None:
+                    return None
+                self.result[r, c] = pixels
+                nDone += r.size
+                if not self.progress(nDone/rows.size):
+                    return False
+            computed |= new
+            if step > 1:
+                #Each computed pixel stands for a step x step square
+                preview = self.colour_result(self.result[::step, ::step])
+                preview = preview.repeat(step, axis=0).repeat(step, axis=1)
+                self.iArray[:] = preview[:self.ySize, :self.xSize]
+                self.progress(nDone/rows.size, self.iArray.copy(), step)
+        #end_for_step
+        self.iArray[:] = self.colour_result(self.result)
+        self.resultValid = True
+        return True
+
+    def output_image(self):
         im = Image.fromarray(self.iArray)
-        if self.showImage:
+        #(with the GUI, the image is already shown in its window)
+        if self.showImage and self.master is None:
             im.show()
         if self.saveImage:
             self.save_image(im)
 
-        print("Runtime =", datetime.now() - startTime)
-        self.runButton["state"] = "active"
-        self.messageText.set(self.MESSAGES[0])
-
-    def traverse_array(self, array, xStart, xEnd, yStart, yEnd, xSize, ySize):
-        #Make start less than end
-        if xEnd < xStart:
-            xStart, xEnd = xEnd, xStart
-        if yEnd < yStart:
-            yStart, yEnd = yEnd, yStart
-        #Determine increase per pixel
-        xIncr = (xEnd - xStart)/xSize
-        yIncr = (yEnd - yStart)/ySize
-
-        x = xStart
+    def compute_array(self):
+        #Create the image array self.iArray for the current parameters, with 
+        #self.result where the iteration is vectorised. This is done in bands
+        #of rows (of the same planes as the whole image), progress being 
+        #reported after each.
+        #Returns True if finished, False if stopped.
+        self.iArray = np.ones((self.ySize, self.xSize, 3), dtype=np.uint8)
+        self.result = np.zeros((self.ySize, self.xSize), dtype=RESULT_TYPE)
+        self.resultValid = False
+        self.prepare_render()
+        x, y = self.image_planes()
+        if self.processes > 1:
+            vectorised = self.render_tiles(self.iArray, x, y, self.result)
+            if vectorised is None:
+                return False
+        else:
+            vectorised = True
+            nBands = max(8, self.xSize*self.ySize//self.PASS_PIXELS)
+            if self.subdivide:
+                #(subdivision does best on the whole image at once)
+                nBands = 1
+            for row0, row1 in self.get_bands(nBands, self.ySize):
+                bandVectorised = self.traverse_array(self.iArray[row0:row1],
+                                                     x, y[row0:row1], 
+                                                     self.result[row0:row1])
+                vectorised = vectorised and bandVectorised
+                if not self.progress(row1/self.ySize):
+                    return False
+        self.resultValid = vectorised
+        return True
+
+    def render(self, fname=None):
+        #Create the image without the GUI, using the parameters given when 
+        #the object was created. Returns the image array, which is saved 
+        #(.png) if fname is given or saveImage is set. Nothing is shown.
+        if self.contourInputActive == True:
+            self.contourStart = self.maxIter - self.contours - 1
+        self.compute_array()
+        if fname:
+            self.fname = fname
+            self.saveImage = True
+        if self.saveImage:
+            self.save_image(Image.fromarray(self.iArray))
+        return self.iArray
+
+    def __getstate__(self):
+        #Copies for worker processes: everything but the GUI parts and the 
+        #image buffers (the workers have them shared, see render_tiles)
+        state = {key: value for key, value in self.__dict__.items()
+                 if not isinstance(value, (Misc, Variable, ImageTk.PhotoImage,
+                                           Event, Queue))}
+        state["master"] = None
+        for key in self.IMAGE_BUFFERS:
+            if key in state:
+                state[key] = None
+        return state
+
+    def get_bands(self, nBands, ySize):
+        #Split the image into nBands bands of rows, giving for each:
+        #(first row, last row + 1)
+        edges = np.linspace(0, ySize, min(ySize, nBands) + 1).astype(int)
+        return list(zip(edges[:-1], edges[1:]))
+
+    def render_tiles(self, array, x, y, result=None):
+        #As traverse_array, but the array is split into bands of rows which 
+        #are shared out amongst self.processes worker processes. There are 
+        #several bands per process, as some bands take much longer than others.
+        #The processes are started afresh ("spawn"), as this may be called 
+        #from the render thread of the GUI.
+        #Returns None if stopped (see progress).
+        ySize, xSize = array.shape[:2]
+        bands = [(row0, row1, x, y[row0:row1]) 
+                 for row0, row1 in self.get_bands(8*self.processes, ySize)]
+        sharedArray = RawArray("B", array.size)
+        sharedResult = RawArray("B", xSize*ySize*RESULT_TYPE.itemsize)
+        shape = (ySize, xSize, 3)
+        vectorised = True
+        rowsDone = 0
+        with get_context("spawn").Pool(self.processes, 
+                 initializer=init_tile_worker, 
+                 initargs=(self, sharedArray, sharedResult, shape)) as pool:
+            for rows, bandVectorised in pool.imap_unordered(render_tile, 
+                                                            bands):
+                vectorised = vectorised and bandVectorised
+                rowsDone += rows
+                if not self.progress(rowsDone/ySize):
+                    return None
+        array[:] = np.frombuffer(sharedArray, dtype=np.uint8).reshape(shape)
+        if result is not None and vectorised:
+            result[:] = np.frombuffer(sharedResult, 
+                                      dtype=RESULT_TYPE).reshape(shape[:2])
+        return vectorised
+
+    def traverse_array(self, array, x, y, result=None):
+        #Fill array with the colour for each pixel, at x and y given by planes
+        #(see image_planes) or bands of rows of them. If the iteration is 
+        #vectorised, the results are also put into result (if given) and 
+        #True is returned.
+        if self.vectorise:
+            #Whole grid at once, if the iteration allows it
+            if self.subdivide:
+                pixels = self.subdivide_array(x, y)
+            else:
+                pixels = self.iterate_array(self.xSeed, self.ySeed, x, y,
+                                            self.maxIter, self.limit)
+            if pixels is not None:
+                if result is not None:
+                    result[:] = pixels
+                array[:] = self.colour_result(pixels)
+                return True
+
+        xSize, ySize = x.shape[1], y.shape[0]
         for xPixel in range(xSize):
-            y = yStart
             for yPixel in range(ySize):
                 # - do something -
                 colour = self.iterate(self.xSeed, self.ySeed, 
-                                      x, y, self.setColour, 
+                                      float(x[0, xPixel]),
+                                      float(y[ySize -1 -yPixel, 0]), 
+                                      self.setColour, 
                                       self.maxIter, self.limit)
                 array[(ySize -1 -yPixel), xPixel] = colour
-                y+= yIncr
             #end_for_y
-            x += xIncr
         #end_for_x
+        return False
+
+    def prepare_render(self):
+        #Anything to be done once per image, before the bands are iterated
+        #(and copied to any worker processes)
+        pass
+
+    def image_planes(self):
+        #Planes (see get_planes) for the whole image, for the current ranges
+        xStart, xEnd, yStart, yEnd = self.xStart, self.xEnd, \
+                                     self.yStart, self.yEnd
+        #Make start less than end
+        if xEnd < xStart:
+            xStart, xEnd = xEnd, xStart
+        if yEnd < yStart:
+            yStart, yEnd = yEnd, yStart
+        #Determine increase per pixel
+        xIncr = (xEnd - xStart)/self.xSize
+        yIncr = (yEnd - yStart)/self.ySize
+        return self.get_planes(xStart, yStart, xIncr, yIncr, 
+                               self.xSize, self.ySize)
+
+    def get_planes(self, xStart, yStart, xIncr, yIncr, xSize, ySize):
+        #x and y values for every pixel, arranged as in the image array 
+        #(i.e. y decreases down the rows). Shapes (1, xSize) and (ySize, 1).
+        #The values are as from repeated x += xIncr (y += yIncr), exactly as
+        #in the per-pixel traverse.
+        x = np.add.accumulate(np.r_[xStart, np.full(xSize - 1, xIncr)])
+        y = np.add.accumulate(np.r_[yStart, np.full(ySize - 1, yIncr)])
+        return x[np.newaxis, :], y[::-1, np.newaxis]
+
+    def subdivide_array(self, x, y, minSize=16):
+        #Mariani-Silver: as iterate_array for the planes x and y (see 
+        #get_planes), but only the edges of rectangles are iterated. Where the
+        #edge of a rectangle is all the same colour (index) the inside is 
+        #filled with that result, otherwise the rectangle is split into four. 
+        #Small rectangles (minSize) are iterated completely. Each level (size
+        #of rectangle) is one call to iterate_array: the edges of its 
+        #rectangles, with the insides of the small ones from the level before.
+        #Once filling has started, a level which fills less than 
+        #SUBDIVIDE_FILL of the area it looked at ends the splitting: the rest
+        #is iterated as usual.
+        ySize, xSize = y.shape[0], x.shape[1]
+        result = np.zeros((ySize, xSize), dtype=RESULT_TYPE)
+        done = np.zeros((ySize, xSize), dtype=bool)
+
+        def compute(pixels):
+            #Iterate the pixels (flat indices) not yet done
+            if not pixels:
+                return True
+            wanted = np.zeros(done.size, dtype=bool)
+            for part in pixels:
+                wanted[part] = True
+            pixels = np.flatnonzero(wanted & ~done.ravel())
+            rows, columns = np.divmod(pixels, xSize)
+            computed = self.iterate_array(self.xSeed, self.ySeed, 
+                                          x[0, columns], y[rows, 0],
+                                          self.maxIter, self.limit)
+            if computed is None:
+                return False
+            result.flat[pixels] = computed
+            done.flat[pixels] = True
+            return True
+
+        def edge(r0, r1, c0, c1):
+            rows = np.concatenate([np.full(c1 - c0 + 1, r0), 
+                                   np.full(c1 - c0 + 1, r1),
+                                   np.arange(r0 + 1, r1), 
+                                   np.arange(r0 + 1, r1)])
+            columns = np.concatenate([np.arange(c0, c1 + 1), 
+                                      np.arange(c0, c1 + 1),
+                                      np.full(r1 - r0 - 1, c0), 
+                                      np.full(r1 - r0 - 1, c1)])
+            return rows*xSize + columns
+
+        def inside(r0, r1, c0, c1):
+            rows, columns = np.mgrid[r0 + 1:r1, c0 + 1:c1]
+            return (rows*xSize + columns).ravel()
+
+        #Rectangles are given by the rows and columns of their edges
+        rectangles = [(0, ySize - 1, 0, xSize - 1)]
+        complete = []
+        started = False
+        while rectangles or complete:
+            edges = [edge(*rect) for rect in rectangles]
+            if not compute(complete + edges):
+                return None
+            split = []
+            complete = []
+            area = filled = 0
+            for (r0, r1, c0, c1), pixels in zip(rectangles, edges):
+                if r1 - r0 < 2 or c1 - c0 < 2:
+                    continue #nothing inside
+                area += (r1 - r0 - 1)*(c1 - c0 - 1)
+                index = self.colour_index(result.flat[pixels])
+                inSet = result["inSet"].flat[pixels]
+                if (index == index[0]).all() and (inSet == inSet[0]).all():
+                    result[r0 + 1:r1, c0 + 1:c1] = result.flat[pixels[0]]
+                    done[r0 + 1:r1, c0 + 1:c1] = True
+                    filled += (r1 - r0 - 1)*(c1 - c0 - 1)
+                elif r1 - r0 <= minSize or c1 - c0 <= minSize:
+                    complete.append(inside(r0, r1, c0, c1))
+                else:
+                    rMid, cMid = (r0 + r1)//2, (c0 + c1)//2
+                    split += [(r0, rMid, c0, cMid), (r0, rMid, cMid, c1),
+                              (rMid, r1, c0, cMid), (rMid, r1, cMid, c1)]
+            #end_for
+            #(the first levels, of large rectangles, seldom fill anything)
+            started = started or filled > 0
+            if split and started and filled < self.SUBDIVIDE_FILL*area:
+                #The rest by bands of the planes (quicker than as pixels)
+                nBands = max(1, xSize*ySize//self.PASS_PIXELS)
+                for row0, row1 in self.get_bands(nBands, ySize):
+                    band = self.iterate_array(self.xSeed, self.ySeed, x, 
+                                              y[row0:row1], self.maxIter,
+                                              self.limit)
+                    rest = ~done[row0:row1]
+                    result[row0:row1][rest] = band[rest]
+                #end_for
+                return result
+            rectangles = split
+        #end_while
+        return result
+
+    def make_result(self, count, root=0, inSet=None):
+        #Result array (see RESULT_TYPE) from the iteration counts etc.
+        #By default, "in the set" means the iteration did not finish (-1).
+        result = np.empty(np.shape(count), dtype=RESULT_TYPE)
+        result["count"] = count
+        result["root"] = root
+        if inSet is None:
+            inSet = (count < 0)
+        result["inSet"] = inSet
+        return result
+
+    def iterate_array(self, x1, y1, x2, y2, maxIter, limit):
+        #Vectorised counterpart of iterate, taking arrays of points and 
+        #returning an array of results (see make_result). 
+        #None: there is no vectorised version, iterate per pixel.
+        return None
 
     def iterate(self, x1, y1, x2, y2, colour, maxIter, limit):
         #Dummy iteration
@@ -524,8 +1052,14 @@ class Julia(GenIteration):
     title = "Julia:  z0 = x, iy;  z := z**2 + c;  c fixed"
     #It is possible to change the initial "seed" value of c
     #via the generic GUI
+
+    def __init__(self, master=None, **kwargs):
+        self.periodTolerance = kwargs.setdefault("periodTolerance", 1e-12)
+        super().__init__(master, **kwargs)
     
     def iterate(self, cReal, cImag, zReal, zImag, colour, maxIter, limit):
+        tolerance = self.periodTolerance
+        xSaved, ySaved, saveAt = zReal, zImag, 1
         for i in range(maxIter):
             #Compute next z value
             zReal, zImag, rSq = self.function(zReal, zImag, cReal, cImag)
@@ -533,9 +1067,20 @@ class Julia(GenIteration):
             if rSq > limit:
                 colour = self.get_contour_colour(i)
                 break
+            #Periodic?
+            if abs(zReal - xSaved) < tolerance \
+               and abs(zImag - ySaved) < tolerance:
+                break
+            if i + 1 == saveAt:
+                xSaved, ySaved, saveAt = zReal, zImag, saveAt + saveAt
         #end_for_i
         return colour
 
+    def iterate_array(self, cReal, cImag, zReal, zImag, maxIter, limit):
+        return self.make_result(escape_count(self.function, zReal, zImag, 
+                                             cReal, cImag, maxIter, limit,
+                                             self.periodTolerance))
+
     def function(self, x, y, cr, ci):
         #Compute z**2 + c
         xSq = x*x
@@ -554,17 +1099,103 @@ class Mandelbrot(GenIteration):
     title = "Mandelbrot:  z0 = 0;  z := z**2 + c;  c = (x, iy)"
     #It is possible to change the initial "seed" value of z0 
     #via the generic GUI
+    #The shape of the main cardioid & bulb is known (only) for z**2 + c,
+    #likewise deep zoom (module deepzoom) is only for z**2 + c:
+    knownInterior = True
     
-    def __init__(self, master, **kwargs):
+    def __init__(self, master=None, **kwargs):
         kwargs.setdefault("seed", [0, 0])
         kwargs.setdefault("xStart", -2)
         kwargs.setdefault("xEnd", 1)
         kwargs.setdefault("yStart", -1.125)
         kwargs.setdefault("imageRatio", 0.75)
         kwargs.setdefault("palette", "5CAL_5")
+        self.interiorCheck = kwargs.setdefault("interiorCheck", True)
+        self.periodTolerance = kwargs.setdefault("periodTolerance", 1e-12)
+        self.deepZoom = kwargs.setdefault("deepZoom", False)
+        self.seriesApprox = kwargs.setdefault("seriesApprox", True)
+        if self.deepZoom and not self.knownInterior:
+            print("Deep zoom is only for z**2 + c")
+            self.deepZoom = False
+        if self.deepZoom:
+            #Ranges may be given as strings, to any number of digits
+            kwargs["vectorise"] = True
+            self.orbit = None
+            self.orbitKey = None
         super().__init__(master, **kwargs)
+        if self.deepZoom:
+            self.ABSURD_ITER = 1000000
+
+    def to_number(self, value):
+        if self.deepZoom:
+            return Decimal(str(value))
+        return float(value)
+
+    def set_range(self, xStart, xEnd, yStart, yEnd=None):
+        if not self.deepZoom:
+            super().set_range(xStart, xEnd, yStart, yEnd)
+            return
+        #The view is held in Decimal, with enough digits for its width. 
+        #xStart etc. become (float) offsets from the reference point at the
+        #centre, this is all that traverse_array needs.
+        digits = max(len(str(v)) for v in (xStart, xEnd, yStart, yEnd))
+        with localcontext() as context:
+            context.prec = digits + 20
+            super().set_range(xStart, xEnd, yStart, yEnd)
+            view = [self.xStart, self.xEnd, self.yStart, self.yEnd]
+            width = self.xEnd - self.xStart
+            if width > 0:
+                context.prec = max(context.prec, 20 - int(width.log10()))
+            self.precision = context.prec
+            self.view = view
+            self.reference = ((view[0] + view[1])/2, (view[2] + view[3])/2)
+            self.xStart, self.xEnd, self.yStart, self.yEnd = [
+                    float(view[n] - self.reference[n//2]) for n in range(4)]
+        self.orbit = None
+
+    def range_text(self):
+        if self.deepZoom:
+            return [str(v) for v in self.view]
+        return super().range_text()
+
+    def prepare_render(self):
+        if self.deepZoom:
+            self.get_orbit()
+
+    def get_orbit(self):
+        #Reference orbit for deep zoom, and the series approximation (if 
+        #used) checked at a 3 x 3 grid over the view. Kept until something 
+        #changes, as are the extra references made for glitches.
+        key = (self.reference, self.maxIter, self.limit, 
+               self.xSeed, self.ySeed)
+        if self.orbit is None or key != self.orbitKey:
+            self.orbit = reference_orbit(self.reference[0], 
+                                         self.reference[1], 
+                                         self.xSeed, self.ySeed, 
+                                         self.maxIter, self.limit, 
+                                         self.precision)
+            self.references = []
+            self.series = None
+            if self.seriesApprox:
+                probes = probe_points(self.xStart, self.xEnd, 
+                                      self.yStart, self.yEnd)
+                self.series = series_approximation(self.orbit, probes, 
+                                                   self.maxIter, self.limit)
+                print("Series approximation skips", self.series[0], 
+                      "iterations")
+            self.orbitKey = key
+        return self.orbit, self.series
+
+    def check_interior(self, zReal, zImag):
+        #Can the cardioid/bulb test be used? Not if there is a seed.
+        return self.interiorCheck and self.knownInterior \
+               and zReal == 0 and zImag == 0
         
     def iterate(self, zReal, zImag, cReal, cImag, colour, maxIter, limit):
+        if self.check_interior(zReal, zImag) and in_main_bulbs(cReal, cImag):
+            return colour
+        tolerance = self.periodTolerance
+        xSaved, ySaved, saveAt = zReal, zImag, 1
         for i in range(maxIter):
             #Compute next z value
             zReal, zImag, rSq = self.function(zReal, zImag, cReal, cImag)
@@ -572,9 +1203,41 @@ class Mandelbrot(GenIteration):
             if rSq > limit:
                 colour = self.get_contour_colour(i)
                 break
+            #Periodic?
+            if abs(zReal - xSaved) < tolerance \
+               and abs(zImag - ySaved) < tolerance:
+                break
+            if i + 1 == saveAt:
+                xSaved, ySaved, saveAt = zReal, zImag, saveAt + saveAt
         #end_for_i
         return colour
 
+    def iterate_array(self, zReal, zImag, cReal, cImag, maxIter, limit):
+        if self.deepZoom:
+            #c is given relative to the reference point
+            shape = np.broadcast(cReal, cImag).shape
+            dc = np.ravel(np.broadcast_to(cReal + 1j*cImag, shape))
+            orbit, series = self.get_orbit()
+            return self.make_result(deep_count(dc, self.reference, orbit, 
+                                               zReal, zImag, maxIter, limit,
+                                               self.precision, series,
+                                               self.references
+                                               ).reshape(shape))
+        if not self.check_interior(zReal, zImag):
+            return self.make_result(escape_count(self.function, zReal, zImag, 
+                                                 cReal, cImag, maxIter, limit,
+                                                 self.periodTolerance))
+        #Only iterate points outside the cardioid and bulb
+        shape = np.broadcast(cReal, cImag).shape
+        cReal = np.broadcast_to(cReal, shape)
+        cImag = np.broadcast_to(cImag, shape)
+        outside = ~in_main_bulbs(cReal, cImag)
+        count = np.full(shape, -1, dtype=np.int32)
+        count[outside] = escape_count(self.function, zReal, zImag, 
+                                      cReal[outside], cImag[outside], 
+                                      maxIter, limit, self.periodTolerance)
+        return self.make_result(count)
+
     def function(self, x, y, cr, ci):
         #Compute z**2 + c
         xSq = x*x
@@ -593,7 +1256,7 @@ class MbrotRealPower(GenIteration):
     """
     title = "Mandelbrot++:  z0 = 0;  z := z**power + c;  c = (x, iy)"
 
-    def __init__(self, master, **kwargs):
+    def __init__(self, master=None, **kwargs):
         self.zPower = kwargs.setdefault("zPower", 3)
         kwargs.setdefault("seed", [0, 0])
         kwargs.setdefault("xStart", -1.6)
@@ -615,6 +1278,16 @@ class MbrotRealPower(GenIteration):
         #end_for_i
         return colour
 
+    def iterate_array(self, zReal, zImag, cReal, cImag, maxIter, limit):
+        #Only if compiled (module kernels), otherwise iterate is used
+        if not JIT:
+            return None
+        count = compiled_count(real_power_count, zReal, zImag, cReal, cImag,
+                               float(self.zPower), maxIter, float(limit))
+        if count is None:
+            return None
+        return self.make_result(count)
+
 
 class Mandelbar(Mandelbrot):
     """ 
@@ -623,7 +1296,8 @@ class Mandelbar(Mandelbrot):
     @author: Owner
     """
     title = "Mandelbar:  z := (z_conj)**2 + c;  c = (x, iy)"
-    def __init__(self, master, **kwargs):
+    knownInterior = False
+    def __init__(self, master=None, **kwargs):
         kwargs.setdefault("xStart", -2.6)
         kwargs.setdefault("xEnd", 2.2)
         kwargs.setdefault("yStart", -1.8)
@@ -648,7 +1322,8 @@ class Burning(Mandelbrot):
     @author: Owner
     """
     title = "Burning Ship:  z := (|R(z)| + i|I(z)|)**2 + c;  c = (x, iy)"
-    def __init__(self, master, **kwargs):
+    knownInterior = False
+    def __init__(self, master=None, **kwargs):
         kwargs.setdefault("xStart", -2.8)
         kwargs.setdefault("xEnd", 2)
         kwargs.setdefault("yStart", -2.3)
@@ -662,10 +1337,9 @@ class Burning(Mandelbrot):
     
     def function(self, x, y, cr, ci):
         #Compute (|R(z)| + i|I(z)|)**2 + c
-        if x < 0:
-            x = -x
-        if y < 0:
-            y = -y
+        #(abs() so that this works for numpy arrays as well)
+        x = abs(x)
+        y = abs(y)
         xSq = x*x
         ySq = y*y
         y = x*y
@@ -682,7 +1356,7 @@ class NCubeRoot1(GenIteration):
     """
     title = "Cube Root (Newton)"
 
-    def __init__(self, master, **kwargs):
+    def __init__(self, master=None, **kwargs):
         kwargs.setdefault('setColour', [0xFF,0x40,0x40])
         kwargs.setdefault('palette', '4CAL_4')
         kwargs.setdefault('maxIter', 16)
@@ -701,7 +1375,7 @@ class NCubeRoot1(GenIteration):
             return 3
         else:
             return 0
-    
+
     def iterate(self, xSeed, ySeed, x, y, colour, maxIter, limit):
         # Find cube roots of 1 using Newton's method
         # Internally:
@@ -727,6 +1401,17 @@ class NCubeRoot1(GenIteration):
         #end_for_i
         return colour
 
+    def iterate_array(self, xSeed, ySeed, x, y, maxIter, limit):
+        #As iterate, for all points at once (see module kernels). Points 
+        #which reach the origin (or start there) find no root.
+        count, root = newton_cube_roots(x, y, maxIter, limit)
+        return self.make_result(count, root, root == 0)
+
+    def colour_index(self, result):
+        if self.showBasins == True:
+            return result["root"]
+        return result["count"]
+
 
 class NComplexRoot(GenIteration):
     """
@@ -761,7 +1446,7 @@ class NComplexRoot(GenIteration):
                     if abs(zPolar.val_angle() - j*self.testAngle) < limit:
                         return j + 1
         return 0
-    
+
     def iterate(self, xSeed, ySeed, x, y, colour, maxIter, limit):
         #Find roots of 1 using Newton's method
         #Internally:
@@ -788,6 +1473,74 @@ class NComplexRoot(GenIteration):
         #end_for_i
         return colour
 
+    def iterate_array(self, xSeed, ySeed, x, y, maxIter, limit):
+        #As iterate, for all points at once (see module kernels). Points 
+        #which start at the origin find no root.
+        count, root = newton_roots_of_one(x, y, self.power, maxIter, limit)
+        return self.make_result(count, root, root == 0)
+
+    def colour_index(self, result):
+        if self.showBasins == True:
+            return result["root"]
+        return result["count"]
+
+class NPolynomial(GenIteration):
+    """
+    Date: 18 Oct 26
+    Shows contours in the basins of attraction for the roots of a 
+    polynomial, approached using Newton's method. The polynomial is given by
+    its coefficients, highest power first, e.g. [1, 0, -2, 2] for
+    z**3 - 2z + 2.
+    """
+    title = "Polynomial (Newton)"
+
+    def __init__(self, master=None, **kwargs):
+        self.coefficients = kwargs.setdefault('coefficients', [1, 0, -2, 2])
+        kwargs.setdefault('setColour', [0x03,0x03,0x03])
+        kwargs.setdefault('palette', '10CAL_10')
+        kwargs.setdefault('maxIter', 40)
+        kwargs.setdefault('limit', 0.0025) #square of distance from root
+        self.showBasins = kwargs.setdefault('showBasins', True)
+        #Roots numbered anticlockwise from the positive real axis
+        roots = np.roots(self.coefficients)
+        self.roots = roots[np.argsort(np.angle(roots) % (2*pi))]
+        self.derivative = np.polyder(np.poly1d(self.coefficients)).coeffs
+        super().__init__(master, **kwargs)
+        self.lookup = root_table(self.roots, self.limit)
+        print("Roots:", np.round(self.roots, 6))
+
+    def iterate(self, xSeed, ySeed, x, y, colour, maxIter, limit):
+        #Newton's method for one point (as newton_polynomial)
+        z = complex(x, y)
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            for i in range(maxIter):
+                z = complex(z - horner(self.coefficients, z)
+                                /horner(self.derivative, z))
+                if not np.isfinite(z):
+                    break
+                #(the nearest root, should more than one be close)
+                distance = abs(z - self.roots)**2
+                rootFound = distance.argmin()
+                if distance[rootFound] < limit:
+                    if self.showBasins == True:
+                        return self.get_contour_colour(rootFound + 1)
+                    else:
+                        return self.get_contour_colour(i)
+            #end_for_i
+        return colour
+
+    def iterate_array(self, xSeed, ySeed, x, y, maxIter, limit):
+        #As iterate, for all points at once (see module kernels)
+        count, root = newton_polynomial(x, y, self.coefficients, 
+                                        self.derivative, self.roots, 
+                                        maxIter, limit, self.lookup)
+        return self.make_result(count, root, root == 0)
+
+    def colour_index(self, result):
+        if self.showBasins == True:
+            return result["root"]
+        return result["count"]
+
 class MagModel1(GenIteration):
     """ 
     Date: 14 Dec 22
@@ -796,7 +1549,7 @@ class MagModel1(GenIteration):
     """
     title = "Magnetism model 1"
 
-    def __init__(self, master, **kwargs):
+    def __init__(self, master=None, **kwargs):
         kwargs.setdefault("seed", [0, 0])
         kwargs.setdefault("xStart", -0.9)
         kwargs.setdefault("xEnd", 3.5)
@@ -819,6 +1572,16 @@ class MagModel1(GenIteration):
         #end_for_i
         return colour
 
+    def iterate_array(self, zReal, zImag, cReal, cImag, maxIter, limit):
+        #Only if compiled (module kernels), otherwise iterate is used
+        if not JIT:
+            return None
+        count = compiled_count(magnet1_count, zReal, zImag, cReal, cImag,
+                               maxIter, float(limit))
+        if count is None:
+            return None
+        return self.make_result(count)
+
     def function(self, var1, var2):
         temp1 = var1.power(2).plus(var2).add_c1(-1)
         temp2 = var1.times(2).plus(var2).add_c1(-2)
@@ -848,6 +1611,9 @@ if __name__ == "__main__":
         myGUI = NCubeRoot1(root, xSize=800, maxIter=12, showBasins=False)
     if current == "nz":
         myGUI = NComplexRoot(root, 10, xSize=600, maxIter=20, showBasins=True)
+    if current == "np":
+        myGUI = NPolynomial(root, coefficients=[1, 0, 0, 0, 0, 3, -1], 
+                            xSize=600, xStart=-2, xEnd=2, yStart=-1.5)
     if current == "p":
         myGUI = MbrotRealPower(root, zPower=3.85, maxIter=60, limit=49)
     if current == "mag1":
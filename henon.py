@@ -11,13 +11,39 @@ Rev 1.2 - 15 Dec 22
     * No longer prints to console when point out of display bounds
 Rev 1.3 - 18 Dec 22
     * Adds text to plot, requires subclasses to give a title
+Rev 1.4 - 18 Oct 26
+    * Density mode (module density): the hits on each pixel are counted, and
+      the image shows the counts (log or gamma scale) in colour0. Switch 
+      "density", parameters "toneMap" and "gamma". A histogram from other
+      runs may be given to be added in ("histogram"), the result is kept in
+      self.histogram.
+Rev 1.5 - 18 Oct 26
+    * Vectorised: all the orbits (one for Henon, "kicks" for Orbiter) are
+      iterated at once as numpy arrays, orbits which diverge are dropped.
+      Switch "vectorise".
+    * The orbits are generated in chunks (orbit_chunks), using a compiled 
+      kernel if numba is installed. The image (rasterise), the histogram or
+      a file (write_orbit) take the chunks as they come, so very long runs
+      use a constant amount of memory.
+    * Checkpoints (module checkpoint): "checkpoint" names a file to save the
+      state to when done (where the orbits have got to, the hits so far and 
+      the parameters); "resume" a file to carry on from. maxIter remains the
+      total, so a resumed run only does the steps still missing (it may not 
+      be less than the checkpoint's). Needs vectorise. A resumed histogram 
+      replaces "histogram".
 @author: Owner
 """
 
 from math import sin, cos, pi
+import numpy as np
 from matplotlib.pyplot import rcParams, savefig, subplots, title, xlabel, ylabel
 from numpy import ones, uint8
 from PIL import Image
+from density import new_histogram, tone_map
+from checkpoint import save_checkpoint, load_checkpoint
+from kernels import JIT, run_compiled, henon_orbit, orbiter_orbit
+
+CHUNK_POINTS = 1 << 20 #Orbit points generated at once (limits memory used)
 
 class Henon():
     title = "Hénon Attractor"
@@ -33,6 +59,13 @@ class Henon():
         self.maxIter = kwargs.setdefault("maxIter", 600)
         self.colour0 = kwargs.setdefault("colour0", [0xFF, 0x00, 0xF0])
         self.colour1 = kwargs.setdefault("colour1", [0x00, 0xF0, 0xFF])
+        self.density = kwargs.setdefault("density", False)
+        self.toneMap = kwargs.setdefault("toneMap", "log")
+        self.gamma = kwargs.setdefault("gamma", 0.5)
+        self.baseHistogram = kwargs.setdefault("histogram", None)
+        self.vectorise = kwargs.setdefault("vectorise", True)
+        self.checkpoint = kwargs.setdefault("checkpoint", None)#file to save to
+        self.resume = kwargs.setdefault("resume", None)#file to carry on from
         self.SUCCESS = 1
         self.OVERFLOW = 2
         self.OUTOFBOUNDS = 3
@@ -45,7 +78,7 @@ class Henon():
 
         self.myArray = ones((self.ySize, self.xSize, 3), dtype=uint8)
         self.set_scales()
-        self.iterate(self.seed[0], self.seed[1])
+        self.draw()
 
         #Create a figure of the right size with one axes that takes up the full 
         #figure
@@ -74,7 +107,7 @@ class Henon():
 
         self.myArray = ones((self.ySize, self.xSize, 3), dtype=uint8)
         self.set_scales()
-        self.iterate(self.seed[0], self.seed[1])
+        self.draw()
 
         #Display the result using PIL
         im = Image.fromarray(self.myArray)
@@ -95,6 +128,35 @@ class Henon():
         self.xIncr = (self.xMax-self.xMin)/self.xSize
         self.yIncr = (self.yMax-self.yMin)/self.ySize        
 
+    def draw(self):
+        #Iterate from the seed (or a checkpoint), into myArray (via histogram 
+        #if density)
+        if not self.vectorise and (self.checkpoint or self.resume):
+            raise ValueError("Checkpoints need vectorise")
+        if self.density:
+            self.histogram = new_histogram(self.ySize, self.xSize, 
+                                           self.baseHistogram)
+        if self.vectorise:
+            first, x, y = 0, None, None
+            if self.resume is not None:
+                first, x, y = self.load_state(self.resume)
+            for start, xs, ys in self.orbit_chunks(x=x, y=y, first=first):
+                self.rasterise(start, xs, ys)
+            #end_for_start
+            if self.checkpoint is not None:
+                self.save_state(self.checkpoint)
+        else:
+            self.iterate(self.seed[0], self.seed[1])
+        if self.density:
+            self.myArray = tone_map(self.histogram, self.colour0, 
+                                    toneMap=self.toneMap, gamma=self.gamma)
+
+    def plot_pixel(self, row, column):
+        if self.density:
+            self.histogram[row, column] += 1
+        else:
+            self.myArray[row, column] = self.colour0
+
     def iterate(self, x, y):
         for i in range(self.maxIter):
             if x==None or y==None:
@@ -105,7 +167,7 @@ class Henon():
                 break
             elif retcode == self.SUCCESS:
                 if i > self.ignore - 1:
-                    self.myArray[(self.ySize -1 -yPixel), xPixel] = self.colour0
+                    self.plot_pixel(self.ySize -1 -yPixel, xPixel)
             else:
                 #print("OOB - pixel, (x,y)=", x, y, "Iter:", i)
                 pass
@@ -118,6 +180,126 @@ class Henon():
                 break
         #end_for_i
     
+    def start_points(self):
+        #Arrays of x and y, where each orbit starts
+        return np.array([self.seed[0]], dtype=np.float64), \
+               np.array([self.seed[1]], dtype=np.float64)
+
+    def orbit_chunks(self, steps=None, x=None, y=None, first=0):
+        #Generator: the orbits from (x[n], y[n]) at step first (default 
+        #start_points, at 0), up to step steps (default maxIter). Yields 
+        #(start, xs, ys): the step number of the first row, and the points as
+        #rows of steps, columns of orbits. Orbits which diverge are dropped 
+        #between chunks. Where the orbits have got to is kept in 
+        #self.position and self.stepsDone (for save_state).
+        if x is None:
+            x, y = self.start_points()
+        steps = self.maxIter if steps is None else steps
+        start = first
+        self.position, self.stepsDone = (x, y), start
+        while start < steps and x.size > 0:
+            chunk = min(steps - start, max(1, CHUNK_POINTS//x.size))
+            xs, ys, x, y = self.orbit_steps(x, y, chunk)
+            start += chunk
+            finite = np.isfinite(x) & np.isfinite(y)
+            x, y = x[finite], y[finite]
+            self.position, self.stepsDone = (x, y), start
+            yield start - chunk, xs, ys
+        #end_while
+
+    def orbit_steps(self, x, y, steps):
+        #steps points of the orbits from (x[n], y[n]) as rows, and where the
+        #orbits go next. Non-finite points are left in, for the caller.
+        result = self.compiled_steps(x, y, steps)
+        if result is not None:
+            return result
+        xs = np.empty((steps, x.size))
+        ys = np.empty((steps, x.size))
+        if x.size == 1:
+            #Plain floats are quicker for a single orbit
+            xn, yn = float(x[0]), float(y[0])
+            for i in range(steps):
+                xs[i, 0] = xn
+                ys[i, 0] = yn
+                retcode, xn, yn = self.function(self.constants, xn, yn)
+                if retcode == self.OVERFLOW:
+                    xn = yn = float("nan")
+            #end_for_i
+            return xs, ys, np.array([xn]), np.array([yn])
+        with np.errstate(over="ignore", invalid="ignore"):
+            for i in range(steps):
+                xs[i] = x
+                ys[i] = y
+                #(function works on arrays too)
+                retcode, x, y = self.function(self.constants, x, y)
+            #end_for_i
+        return xs, ys, x, y
+
+    def compiled_steps(self, x, y, steps):
+        #orbit_steps by a compiled kernel, None if there is none. The kernel
+        #is Henon's function: a subclass with another function has none 
+        #(unless it overrides this too).
+        if not JIT or type(self).function is not Henon.function:
+            return None
+        return run_compiled(henon_orbit, x, y, float(self.constants[0]), 
+                            float(self.constants[1]), steps)
+
+    def rasterise(self, start, xs, ys):
+        #Plot a chunk of points from orbit_chunks, in myArray or histogram
+        skip = min(len(xs), max(0, self.ignore - start))
+        with np.errstate(over="ignore", invalid="ignore"):
+            xPixel = np.trunc((xs[skip:].ravel() - self.xMin)/self.xIncr)
+            yPixel = np.trunc((ys[skip:].ravel() - self.yMin)/self.yIncr)
+        #(non-finite points fail these tests)
+        inside = (xPixel > -1) & (xPixel < self.xSize) \
+                 & (yPixel > -1) & (yPixel < self.ySize)
+        pixel = ((self.ySize - 1 - yPixel[inside])*self.xSize
+                 + xPixel[inside]).astype(np.int64)
+        if self.density:
+            self.histogram += np.bincount(pixel, minlength=self.histogram.size
+                                          ).reshape(self.histogram.shape)
+        else:
+            self.myArray.reshape(-1, 3)[pixel] = self.colour0
+
+    def write_orbit(self, fname, steps=None):
+        #Write the orbit points to a binary file as they are generated: 
+        #float64 (x, y) pairs, step by step. Read with 
+        #np.fromfile(fname).reshape(-1, 2)
+        with open(fname, "wb") as f:
+            for start, xs, ys in self.orbit_chunks(steps):
+                np.stack((xs, ys), axis=-1).tofile(f)
+            #end_for_start
+
+    def parameters(self):
+        #What a checkpoint must agree with, to be carried on from
+        return {"class": type(self).__name__, "constants": self.constants,
+                "seed": self.seed, "ignore": self.ignore,
+                "range": [self.xMin, self.xMax, self.yMin, self.yMax],
+                "size": [self.xSize, self.ySize], "density": self.density,
+                "colour0": self.colour0}
+
+    def save_state(self, fname):
+        #Checkpoint: where the orbits have got to, and the hits so far
+        x, y = self.position
+        hits = {"histogram": self.histogram} if self.density \
+               else {"image": self.myArray}
+        save_checkpoint(fname, self.parameters(), x=x, y=y, 
+                        steps=self.stepsDone, **hits)
+
+    def load_state(self, fname):
+        #Carry on from a checkpoint (save_state): the hits so far go into 
+        #histogram or myArray. Returns the step reached and the orbits there.
+        state = load_checkpoint(fname, self.parameters())
+        if int(state["steps"]) > self.maxIter:
+            raise ValueError("Checkpoint is of " + str(state["steps"])
+                             + " steps, more than maxIter")
+        if self.density:
+            self.histogram = new_histogram(self.ySize, self.xSize, 
+                                           state["histogram"])
+        else:
+            self.myArray = state["image"]
+        return int(state["steps"]), state["x"], state["y"]
+
     def get_pixel(self, xVal, yVal):
         try:
             xPixel = int((xVal-self.xMin)/self.xIncr)
@@ -151,6 +333,8 @@ class Orbiter(Henon):
         self.yMin = kwargs.setdefault("yMin", -2)
         self.yMax = kwargs.setdefault("yMax", 2)
         self.kicks = kwargs.setdefault("kicks", 33)
+        if self.kicks < 1:
+            raise ValueError("Orbiter needs at least one kick")
         self.dx = kwargs.setdefault("dx", 0.015)#x-perturbation
         self.dy = kwargs.setdefault("dy", -0.015)#y-perturbation
         super().__init__(**kwargs)
@@ -160,6 +344,26 @@ class Orbiter(Henon):
             super().iterate(x, y)
             x += self.dx
             y += self.dy
+
+    def start_points(self):
+        #One orbit for each kick, from the seed (as x += dx in iterate)
+        x = np.add.accumulate(np.r_[self.seed[0], 
+                                    np.full(self.kicks - 1, self.dx)])
+        y = np.add.accumulate(np.r_[self.seed[1], 
+                                    np.full(self.kicks - 1, self.dy)])
+        return x.astype(np.float64), y.astype(np.float64)
+
+    def parameters(self):
+        parameters = super().parameters()
+        parameters.update(kicks=self.kicks, dx=self.dx, dy=self.dy)
+        return parameters
+
+    def compiled_steps(self, x, y, steps):
+        #(as Henon.compiled_steps)
+        if not JIT or type(self).function is not Orbiter.function:
+            return None
+        w = self.constants[0]
+        return run_compiled(orbiter_orbit, x, y, cos(w), sin(w), steps)
         
     def function(self, constants, x, y):
         w = constants[0]
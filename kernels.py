@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Vectorised kernels shared by the iteration programs. Rather than iterating
+one pixel at a time, each kernel works on whole numpy arrays of points.
+Rev 1.0 - 18 Oct 26
+    * escape_count(), the escape-time loop for functions of the form used in
+      generic.py, i.e. function(x, y, cr, ci) returning x, y and |z|**2.
+    * in_main_bulbs(), test for the interior of the Mandelbrot set.
+    * escape_count() can detect orbits which have become periodic (Brent's 
+      method), these points are taken to be in the set.
+    * newton_roots_of_one(), Newton's method for the nth roots of one, and
+      root_of_one() to say which root (if any) a point is close to.
+    * newton_polynomial(), Newton's method for any polynomial, with a table 
+      (root_table) to look up which root a point may be close to.
+    * newton_cube_roots(), Newton's method for the cube roots of one, as in 
+      generic.NCubeRoot1 and newton_cr_one.py.
+    * If numba is installed, compiled kernels for the iterations which 
+      otherwise use myMathOO.ComplexVar one pixel at a time: 
+      real_power_count() and magnet1_count(), called via compiled_count().
+      JIT is False if numba is not available (the kernels are then None).
+Rev 1.1 - 18 Oct 26
+    * Compiled orbit kernels for henon.py: henon_orbit() and orbiter_orbit().
+    * JIT is also False if numba is installed but fails to import, and a
+      kernel which fails to compile (or run) is not used again: 
+      run_compiled() then returns None and the callers use their own path.
+@author: Owner
+"""
+import numpy as np
+from math import pi, atan2, cos, sin, sqrt
+try:
+    from numba import njit
+    JIT = True
+except Exception:
+    #(not installed, or not working with this numpy etc.)
+    JIT = False
+
+def escape_count(function, zReal, zImag, cReal, cImag, maxIter, limit,
+                 tolerance=0):
+    #Iterate z := function(z, c) for every point at once.
+    #The arguments may be arrays of any (broadcastable) shape. Only points
+    #that have not yet escaped are computed at each step.
+    #If tolerance > 0, z is compared with a saved value which is renewed 
+    #after 1, 2, 4, 8... iterations: if it returns to within tolerance 
+    #(in x and y) of that value it is periodic, so will not escape.
+    #Returns an array of the iteration at which each point escaped, -1 where
+    #it did not escape within maxIter.
+    shape = np.broadcast(zReal, zImag, cReal, cImag).shape
+    zReal, zImag, cReal, cImag = [np.array(np.broadcast_to(a, shape),
+                                           dtype=np.float64).ravel()
+                                  for a in (zReal, zImag, cReal, cImag)]
+    count = np.full(zReal.size, -1, dtype=np.int32)
+    active = np.arange(zReal.size) #index of each point still iterating
+    savedReal, savedImag = zReal, zImag
+    saveAt = 1
+    with np.errstate(over="ignore", invalid="ignore"):
+        for i in range(maxIter):
+            #Compute next z value
+            zReal, zImag, rSq = function(zReal, zImag, cReal, cImag)
+            #Test
+            escaped = rSq > limit
+            finished = escaped
+            if tolerance > 0:
+                finished = escaped | ((abs(zReal - savedReal) < tolerance)
+                                      & (abs(zImag - savedImag) < tolerance))
+                if i + 1 == saveAt:
+                    savedReal, savedImag = zReal, zImag
+                    saveAt += saveAt
+            if finished.any():
+                count[active[escaped]] = i
+                stay = ~finished
+                active = active[stay]
+                if active.size == 0:
+                    break
+                zReal, zImag = zReal[stay], zImag[stay]
+                cReal, cImag = cReal[stay], cImag[stay]
+                if tolerance > 0:
+                    savedReal, savedImag = savedReal[stay], savedImag[stay]
+        #end_for_i
+    return count.reshape(shape)
+
+def in_main_bulbs(cReal, cImag):
+    #Is c in the main cardioid or the period-2 bulb of the Mandelbrot set?
+    #Such points never escape from z0 = 0, so need not be iterated.
+    #Works for numbers or numpy arrays.
+    xQ = cReal - 0.25
+    ySq = cImag*cImag
+    q = xQ*xQ + ySq
+    cardioid = q*(q + xQ) <= 0.25*ySq
+    bulb = (cReal + 1)*(cReal + 1) + ySq <= 0.0625
+    return cardioid | bulb
+
+def root_of_one(z, n, limit):
+    #Which of the nth roots of one is each of the complex values z close to?
+    #Close means within limit both of the unit circle and of the root's 
+    #angle. Returns 0 for none, 1 for z = 1, then 2, 3... anticlockwise.
+    #The nearest root is found directly by rounding n*angle/(2*pi).
+    angle = np.angle(z)
+    j = np.rint(angle*(n/(2*pi)))
+    close = (abs(abs(z) - 1) < limit) & (abs(angle - j*(2*pi/n)) < limit)
+    return np.where(close, j.astype(np.int16) % n + 1, 0).astype(np.int16)
+
+def newton_roots_of_one(x, y, n, maxIter, limit):
+    #Newton's method, z := z - (z**n - 1)/(n*z**(n-1)), for every point 
+    #z = x + iy at once (arrays of any broadcastable shape).
+    #Returns two arrays: the iteration at which each point came close to a 
+    #root (-1 if it did not within maxIter) and which root, as root_of_one.
+    #Points starting at the origin are not iterated.
+    shape = np.broadcast(x, y).shape
+    z = (np.broadcast_to(x, shape) + 1j*np.broadcast_to(y, shape)).ravel()
+    z = z.astype(np.complex128)
+    count = np.full(z.size, -1, dtype=np.int32)
+    root = np.zeros(z.size, dtype=np.int16)
+    active = np.flatnonzero(z != 0)
+    z = z[active]
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        for i in range(maxIter):
+            #z**(n-1), by repeated squaring
+            zPower = np.ones_like(z)
+            zSquare, m = z, n - 1
+            while m:
+                if m & 1:
+                    zPower = zPower*zSquare
+                zSquare = zSquare*zSquare
+                m >>= 1
+            z = z - (zPower*z - 1)/(zPower*n)
+            rootFound = root_of_one(z, n, limit)
+            found = rootFound > 0
+            if found.any():
+                count[active[found]] = i
+                root[active[found]] = rootFound[found]
+                stay = ~found
+                active = active[stay]
+                if active.size == 0:
+                    break
+                z = z[stay]
+        #end_for_i
+    return count.reshape(shape), root.reshape(shape)
+
+def horner(coefficients, z):
+    #Value of the polynomial (coefficients from the highest power down) at z
+    value = np.zeros_like(z) + coefficients[0]
+    for c in coefficients[1:]:
+        value = value*z + c
+    return value
+
+def root_table(roots, limit):
+    #A grid over the roots, for use by nearest_root: each cell holds the 
+    #number (from 1) of the root it may be close to, 0 for none or -1 if 
+    #there is more than one. limit is the square of the distance taken to 
+    #be close, the cells are at least this size (so that a root's circle 
+    #lies within the 3 x 3 cells around it).
+    low = np.array([roots.real.min(), roots.imag.min()])
+    span = max(np.ptp(roots.real), np.ptp(roots.imag))
+    size = max(limit**0.5, span/256)
+    low -= 2*size
+    cells = int(span/size) + 5
+    table = np.zeros((cells, cells), dtype=np.int16)
+    for j, root in enumerate(roots):
+        column = int((root.real - low[0])/size)
+        row = int((root.imag - low[1])/size)
+        near = table[row - 1:row + 2, column - 1:column + 2]
+        near[:] = np.where(near == 0, j + 1, -1)
+    #end_for_j
+    return low, size, table
+
+def nearest_root(z, roots, lookup, limit):
+    #Which root is each of the complex values z within limit (the square of
+    #the distance) of? 0 for none, otherwise its number in roots from 1.
+    #lookup is from root_table.
+    low, size, table = lookup
+    column = np.floor((z.real - low[0])/size)
+    row = np.floor((z.imag - low[1])/size)
+    inside = (column >= 0) & (column < table.shape[1]) \
+             & (row >= 0) & (row < table.shape[0])
+    root = np.zeros(z.size, dtype=np.int16)
+    root[inside] = table[row[inside].astype(int), column[inside].astype(int)]
+    #Where there may be more than one root, take the nearest
+    several = np.flatnonzero(root < 0)
+    if several.size:
+        distance = abs(z[several, np.newaxis] - roots[np.newaxis, :])
+        root[several] = distance.argmin(axis=1) + 1
+    #Check the distance to the root found
+    found = np.flatnonzero(root > 0)
+    far = abs(z[found] - roots[root[found] - 1])**2 >= limit
+    root[found[far]] = 0
+    return root
+
+def newton_polynomial(x, y, coefficients, derivative, roots, maxIter, limit,
+                      lookup=None):
+    #Newton's method, z := z - p(z)/p'(z), for every point z = x + iy at 
+    #once (arrays of any broadcastable shape). p has the given coefficients
+    #(highest power first), p' the derivative's. A point has found root j 
+    #when |z - roots[j-1]|**2 < limit.
+    #Returns two arrays: the iteration at which each point found a root (-1
+    #if it did not within maxIter) and which root (0 for none).
+    if lookup is None:
+        lookup = root_table(roots, limit)
+    shape = np.broadcast(x, y).shape
+    z = (np.broadcast_to(x, shape) + 1j*np.broadcast_to(y, shape)).ravel()
+    z = z.astype(np.complex128)
+    count = np.full(z.size, -1, dtype=np.int32)
+    root = np.zeros(z.size, dtype=np.int16)
+    active = np.arange(z.size)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        for i in range(maxIter):
+            z = z - horner(coefficients, z)/horner(derivative, z)
+            rootFound = nearest_root(z, roots, lookup, limit)
+            found = rootFound > 0
+            #Points where p'(z) = 0 etc. go no further
+            finished = found | ~np.isfinite(z)
+            if finished.any():
+                count[active[found]] = i
+                root[active[found]] = rootFound[found]
+                stay = ~finished
+                active = active[stay]
+                if active.size == 0:
+                    break
+                z = z[stay]
+        #end_for_i
+    return count.reshape(shape), root.reshape(shape)
+
+def cube_root_of_one(x, y, limit):
+    #Is (x, y) close to one of the cube roots of one (the square of the 
+    #distance less than limit)? 0 if not, otherwise 1, 2 or 3 as below.
+    return np.select([((x+0.5)**2 + (y+0.8660254)**2) < limit,
+                      ((x+0.5)**2 + (y-0.8660254)**2) < limit,
+                      ((x-1)**2 + y**2) < limit], [1, 2, 3], 0)
+
+def newton_cube_roots(x, y, maxIter, limit):
+    #Newton's method for z**3 = 1, for every point z = x + iy at once 
+    #(arrays of any broadcastable shape).
+    #Returns two arrays: the iteration at which each point came close to a 
+    #root (-1 if it did not within maxIter) and which root, as 
+    #cube_root_of_one. Points which reach the origin (or start there) find
+    #no root.
+    shape = np.broadcast(x, y).shape
+    x, y = [np.array(np.broadcast_to(a, shape), dtype=np.float64).ravel()
+            for a in (x, y)]
+    count = np.full(x.size, -1, dtype=np.int32)
+    root = np.zeros(x.size, dtype=np.int16)
+    active = np.arange(x.size)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        for i in range(maxIter):
+            xSq, ySq, dSq = x*x, y*y, (x*x + y*y)
+            temp = 3*(dSq*dSq)
+            x, y = 2*x/3 + (xSq - ySq)/temp, 2*y/3 - 2*x*y/temp
+            rootFound = cube_root_of_one(x, y, limit)
+            #Points which reached the origin go no further
+            finished = (rootFound > 0) | ~np.isfinite(x)
+            if finished.any():
+                found = rootFound > 0
+                count[active[found]] = i
+                root[active[found]] = rootFound[found]
+                stay = ~finished
+                active = active[stay]
+                if active.size == 0:
+                    break
+                x, y = x[stay], y[stay]
+        #end_for_i
+    return count.reshape(shape), root.reshape(shape)
+
+failedKernels = set() #compiled kernels which did not compile or run
+
+def run_compiled(kernel, *args):
+    #kernel(*args), or None if the kernel fails (numba compiles it on the 
+    #first call): it is then not tried again
+    if kernel is None or kernel in failedKernels:
+        return None
+    try:
+        return kernel(*args)
+    except Exception as error:
+        print("Compiled kernel not used:", error)
+        failedKernels.add(kernel)
+        return None
+
+def compiled_count(kernel, zReal, zImag, cReal, cImag, *args):
+    #Call one of the compiled kernels below for arrays cReal, cImag (any
+    #broadcastable shape) and a single seed zReal, zImag. None if the
+    #kernel fails (see run_compiled).
+    shape = np.broadcast(cReal, cImag).shape
+    cReal, cImag = [np.ascontiguousarray(np.broadcast_to(a, shape), 
+                                         dtype=np.float64).ravel()
+                    for a in (cReal, cImag)]
+    count = run_compiled(kernel, float(zReal), float(zImag), cReal, cImag, 
+                         *args)
+    if count is None:
+        return None
+    return count.reshape(shape)
+
+#Compiled kernels (division by zero gives inf or nan, as in numpy, rather 
+#than an error)
+if JIT:
+    @njit(cache=True, error_model="numpy")
+    def real_power_count(zReal, zImag, cReal, cImag, power, maxIter, limit):
+        #z := z**power + c, power real (by De Moivre, as ComplexVar.power_dm),
+        #for each c. Returns the iteration at which |z| > limit, -1 if never.
+        count = np.full(cReal.size, -1, dtype=np.int32)
+        for n in range(cReal.size):
+            x, y = zReal, zImag
+            for i in range(maxIter):
+                #Compute next z value
+                r = (x*x + y*y)**(power/2)
+                angle = atan2(y, x)*power
+                x = r*cos(angle) + cReal[n]
+                y = r*sin(angle) + cImag[n]
+                #Test
+                if sqrt(x*x + y*y) > limit:
+                    count[n] = i
+                    break
+            #end_for_i
+        #end_for_n
+        return count
+
+    @njit(cache=True, error_model="numpy")
+    def magnet1_count(zReal, zImag, cReal, cImag, maxIter, limit):
+        #z := ((z**2 + c - 1)/(2z + c - 2))**2 (magnetism model 1) for each c. 
+        #Returns the iteration at which |z| > limit, -1 if never.
+        count = np.full(cReal.size, -1, dtype=np.int32)
+        for n in range(cReal.size):
+            z = complex(zReal, zImag)
+            c = complex(cReal[n], cImag[n])
+            for i in range(maxIter):
+                #Compute next z value
+                w = (z*z + c - 1)/(z + z + c - 2)
+                z = w*w
+                #Test
+                if abs(z) > limit:
+                    count[n] = i
+                    break
+            #end_for_i
+        #end_for_n
+        return count
+
+    @njit(cache=True, error_model="numpy")
+    def henon_orbit(x, y, a, b, steps):
+        #steps points of the Henon orbits from (x[n], y[n]): rows of steps, 
+        #columns of orbits. Also returns where the orbits go next.
+        xs = np.empty((steps, x.size))
+        ys = np.empty((steps, x.size))
+        xNext = np.empty(x.size)
+        yNext = np.empty(x.size)
+        for n in range(x.size):
+            xn, yn = x[n], y[n]
+            for i in range(steps):
+                xs[i, n] = xn
+                ys[i, n] = yn
+                xn, yn = yn - a*xn*xn + 1, b*xn
+            #end_for_i
+            xNext[n] = xn
+            yNext[n] = yn
+        #end_for_n
+        return xs, ys, xNext, yNext
+
+    @njit(cache=True, error_model="numpy")
+    def orbiter_orbit(x, y, cosW, sinW, steps):
+        #As henon_orbit, for the (area preserving) Orbiter map with angle w
+        xs = np.empty((steps, x.size))
+        ys = np.empty((steps, x.size))
+        xNext = np.empty(x.size)
+        yNext = np.empty(x.size)
+        for n in range(x.size):
+            xn, yn = x[n], y[n]
+            for i in range(steps):
+                xs[i, n] = xn
+                ys[i, n] = yn
+                temp = yn - xn*xn
+                xn, yn = xn*cosW - temp*sinW, xn*sinW + temp*cosW
+            #end_for_i
+            xNext[n] = xn
+            yNext[n] = yn
+        #end_for_n
+        return xs, ys, xNext, yNext
+else:
+    real_power_count = magnet1_count = None
+    henon_orbit = orbiter_orbit = None
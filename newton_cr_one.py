@@ -5,89 +5,87 @@ Rev 1.1: 17 Nov 22 Adds protection for both x and y = 0
 Rev 1.2: 17 Nov 22 Palette defined separately and imported avoiding 
                    editing this file for each change.
 Rev 1.3: 20 Nov 22 The palette-loading mechanicm is now in module "myColour"
+Rev 1.4: 18 Oct 26 The work is done by function render(), nothing happens on
+                   import. The whole image is iterated at once using numpy
+                   (module kernels), in bands of rows, optionally by a pool
+                   of processes. scipy is no longer needed.
 @author: Owner
 
 The program creates an image of the basins of attraction for the cube 
 roots of one, using Newton's method. 
-The image is shown to screen and saved with name tempnimage.png 
-in the current directory.
+Run as a program, the image is shown to screen and saved with name
+tempnimage.png in directory images. From another program, e.g.
+    render(width=7680, processes=8, fname="basins8k.png")
 """
+from multiprocessing import Pool
+import numpy as np
 from numpy import ones, uint8
 from PIL import Image
-from scipy import nextafter
 from myColour import get_palette
+from kernels import cube_root_of_one, newton_cube_roots
 
-def belongs_to_root(x, y, limit):
-    #given (x,y), is the point close to one of the cube roots of one?
-    #returns 0 if not; 1, 2 or 3 depending on which root is close
-    if ((x+0.5)**2 + (y+0.8660254)**2) < limit:
-        return 1
-    elif ((x+0.5)**2 + (y-0.8660254)**2) < limit:
-        return 2
-    elif ((x-1)**2 + y**2) < limit:
-        return 3
-    else:
-        return 0
+LIMIT = 0.0025 #Terminate iteration when closer than this arbitrary limit
+BAND_PIXELS = 1 << 20 #Pixels iterated at once (limits memory used)
 
-def iteration(x, y, maxIter):
-    # Find cube roots of 1 using Newton's method
-    # Return:
+def iterate_band(band):
+    #Find cube roots of 1 using Newton's method, for a band of rows of the
+    #image at once. band is (x, y, maxIter) with x for each column and y for
+    #each row. Returns for each pixel:
     #   0: root not yet determined
     #   1, 2 or 3 for each respective root
     #   4: we started at a root
-    #
-    LIMIT = 0.0025 #Terminate iteration when closer than this arbitrary limit
-    if belongs_to_root(x, y, LIMIT/10):#Comment this out if 
-        return 4                       #you don't want the root marked
-    rootFound = 0
-    for i in range(maxIter):
-        if (x==0) and (y==0):
-            x = nextafter(0,1)
-            continue
-        x_sq, y_sq, d_sq = x*x, y*y, (x*x + y*y)
-        temp = 3*(d_sq*d_sq)
-        x_new = 2*x/3 + (x_sq - y_sq)/temp
-        y_new = 2*y/3 - 2*x*y/temp
-        rootFound = belongs_to_root(x_new, y_new, LIMIT)
-        if rootFound:
-            break
-        x = x_new
-        y = y_new
-    #end_for_i
+    x, y, maxIter = band
+    x = x[np.newaxis, :]
+    y = y[:, np.newaxis]
+    count, rootFound = newton_cube_roots(x, y, maxIter, LIMIT)
+    #Comment this out if you don't want the root marked
+    rootFound[cube_root_of_one(x, y, LIMIT/10) > 0] = 4
     return rootFound
 
-#MAIN
-palette = get_palette("5PALETTE", 5)
-MAX_ITER = 16
-aspect = 3/4
-xStart = -1.4
-xEnd = 1.4
-yStart = -1.05
-yEnd = yStart + (xEnd - xStart)*aspect
-imageWidth = 800
-imageHeight = int(imageWidth*aspect)
-dx = (xEnd - xStart)/imageWidth
-dy = (yEnd - yStart)/imageHeight
+def render(width=800, maxIter=16, xStart=-1.4, xEnd=1.4, yStart=-1.05,
+           aspect=3/4, palette="5PALETTE", processes=1, fname=None,
+           show=False):
+    #Create the image (returned), save it to fname if given
+    colours = np.array(get_palette(palette, 5), dtype=uint8)
+    yEnd = yStart + (xEnd - xStart)*aspect
+    imageWidth = width
+    imageHeight = int(imageWidth*aspect)
+    dx = (xEnd - xStart)/imageWidth
+    dy = (yEnd - yStart)/imageHeight
 
-iArray = ones((imageHeight, imageWidth, 3), dtype=uint8)
+    iArray = ones((imageHeight, imageWidth, 3), dtype=uint8)
 
-#Populate array with colours depending on the result of the iteration
-currentX = xStart
-for pixelX in range(imageWidth):
-    currentY = yStart
-    for pixelY in range(imageHeight):
-        iArray[(imageHeight -1 -pixelY), pixelX] = \
-            palette[iteration(currentX, currentY, MAX_ITER)]
-        currentY += dy
-    currentX += dx
+    #The image is done in bands of rows, from the top
+    x = xStart + np.arange(imageWidth)*dx
+    y = yStart + np.arange(imageHeight - 1, -1, -1)*dy
+    rows = max(1, BAND_PIXELS//imageWidth)
+    bands = [(x, y[row:row + rows], maxIter)
+             for row in range(0, imageHeight, rows)]
+    pool = Pool(processes) if processes > 1 else None
+    try:
+        results = pool.imap(iterate_band, bands) if pool \
+                  else map(iterate_band, bands)
+        #Populate array with colours depending on the result of the
+        #iteration
+        for n, rootFound in enumerate(results):
+            iArray[n*rows:(n + 1)*rows] = colours[rootFound]
+        #end_for_n
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
 
-#Image is complete    
-image = Image.fromarray(iArray)
-image.show()
-try:
-    image.save("images/tempnimage.png", format="PNG")
-except:
-    print("Couldn't save file")
+    #Image is complete
+    image = Image.fromarray(iArray)
+    if show:
+        image.show()
+    if fname is not None:
+        try:
+            image.save(fname, format="PNG")
+        except:
+            print("Couldn't save file")
+    return image
 
-            
-            
+#MAIN
+if __name__ == "__main__":
+    render(fname="images/tempnimage.png", show=True)
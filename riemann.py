@@ -31,23 +31,132 @@ Rev 1.3 - 04 Jan 23
 Rev 1.4 - 13 Jan 23
     * The *Root classes now have a switch so as to show either basins of
       attraction or iteration contours.
+Rev 1.5 - 18 Oct 26
+    * MbrotRIter: points in the main cardioid and period-2 bulb are coloured 
+      without iterating, unless the seed is not zero. Switch "interiorCheck".
+    * The projection (sphere to plane) is computed with numpy for the whole 
+      image at once, and kept for re-use with the same angles and size: 
+      only the iteration is done again for a new maxIter, palette etc.
+      (Those kept take at most MAX_PROJECTION_BYTES.)
+    * Classes may provide iterate_array, working on all points at once
+      (see module kernels). MbrotRIter does so. Switch "vectorise".
+    * render_frames() renders a sequence of views (a path of angles, see 
+      angle_path) as numbered .png files or one animated .gif, optionally 
+      using a pool of processes. The colour of each point in the plane is 
+      kept (PointCache): a point which appears again, in any later frame, 
+      is not iterated again. Nothing is shown on screen. The frames' 
+      projections are not kept.
+    * Optionally the iteration is done once for the whole sphere, on an 
+      equirectangular "texture" (latitude, longitude) of textureSize rows, 
+      and each view just looks up its colours there. Parameter 
+      "textureSize", e.g. 1000, default None (iterate for every view).
+    * NRComplexRoot is vectorised, using the Newton kernel in module kernels.
+    * MbrotRRealPower uses a compiled kernel if numba is installed.
       
 @author: Owner
 (Many thanks to Karl-Heinz Becker and Michael Doerffler)
 """
 from datetime import datetime
+from multiprocessing import Pool
+import numpy as np
 from numpy import ones, uint8
 from PIL import Image
 from sys import path
 from math import pi
+from numpy import sin, cos
 if not "../modules" in path:
     path.append('../modules')
 from myMatrices import matrix_3x3
 import myColour
 from myMathOO import ComplexVar
+from kernels import escape_count, in_main_bulbs, newton_roots_of_one
+from kernels import JIT, compiled_count, real_power_count
+
+def angle_path(start, end, frames):
+    #(xAngle, zAngle) for each of frames steps from start to end (both
+    #pairs of angles), end included
+    return [(start[0] + (end[0] - start[0])*n/(frames - 1),
+             start[1] + (end[1] - start[1])*n/(frames - 1))
+            if frames > 1 else tuple(start) for n in range(frames)]
+
+MAX_CACHED_POINTS = 1 << 22 #Most points kept by PointCache
+KEY_BITS = 12 #Low bits of the plane coordinates ignored by point_keys
+
+def point_keys(x, y):
+    #Keys (complex, so they sort) for points in the plane: equal where the 
+    #coordinates differ only in their last KEY_BITS bits, as from rounding 
+    #in the rotation (e.g. zAngle 0 and 360)
+    mask = np.int64(-1 << KEY_BITS)
+    x = (np.asarray(x, dtype=np.float64).view(np.int64) & mask)
+    y = (np.asarray(y, dtype=np.float64).view(np.int64) & mask)
+    return x.view(np.float64) + 1j*y.view(np.float64)
+
+#
+# Worker processes for render_frames
+#
+frameWorker = {}
+
+def init_frame_worker(iteration):
+    frameWorker["iteration"] = iteration
+
+def colour_chunk(points):
+    x, y = points
+    return frameWorker["iteration"].colour_points(x, y)
+
+class PointCache():
+    """
+    Colours of points in the plane, as used by render_frames, so that a 
+    point seen in an earlier frame is not iterated again. The points are 
+    held sorted by key (point_keys). Beyond MAX_CACHED_POINTS those not used
+    for the most frames are forgotten.
+    """
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.complex128)
+        self.colours = np.empty((0, 3), dtype=uint8)
+        self.lastUse = np.empty(0, dtype=np.int64)
+        self.frame = 0
+        self.looked = 0
+        self.iterated = 0
+
+    def colours_for(self, x, y, colour_points):
+        #Colours for the points (x[n], y[n]) of the next frame: those not 
+        #known already are given by colour_points(x, y), and kept
+        keys = point_keys(x, y)
+        position = np.searchsorted(self.keys, keys)
+        known = position < self.keys.size
+        known[known] = self.keys[position[known]] == keys[known]
+        colours = np.empty((keys.size, 3), dtype=uint8)
+        colours[known] = self.colours[position[known]]
+        self.lastUse[position[known]] = self.frame
+        new = ~known
+        if new.any():
+            colours[new] = colour_points(x[new], y[new])
+            self.add(keys[new], colours[new])
+        self.looked += keys.size
+        self.iterated += np.count_nonzero(new)
+        self.frame += 1
+        return colours
+
+    def add(self, keys, colours):
+        keys, first = np.unique(keys, return_index=True)
+        position = np.searchsorted(self.keys, keys)
+        self.keys = np.insert(self.keys, position, keys)
+        self.colours = np.insert(self.colours, position, colours[first], 
+                                 axis=0)
+        self.lastUse = np.insert(self.lastUse, position, self.frame)
+        if self.keys.size > MAX_CACHED_POINTS:
+            #Forget the points used longest ago
+            cutoff = np.sort(self.lastUse)[self.keys.size - MAX_CACHED_POINTS]
+            keep = self.lastUse >= cutoff
+            self.keys = self.keys[keep]
+            self.colours = self.colours[keep]
+            self.lastUse = self.lastUse[keep]
 
 class RiemannIteration():
     title = "Riemann"
+    #(xMap, yMap, inDisc, greatCircle) for each (xAngle, zAngle, xSize, ySize)
+    projections = {}
+    MAX_PROJECTION_BYTES = 1 << 28 #Most memory used by the projections kept
     def __init__(self, **kwargs):
         self.seed = kwargs.setdefault("seed", [0, 0])
         self.setColour = kwargs.setdefault("setColour", [0xD0,0xFF,0xFF])
@@ -65,10 +174,16 @@ class RiemannIteration():
         self.showImage = kwargs.setdefault("showImage", True)
         self.fileDir = kwargs.setdefault("fileDir", "../images")
         self.fileName = kwargs.setdefault("fileName", "temprimage")
+        self.vectorise = kwargs.setdefault("vectorise", True)
+        self.textureSize = kwargs.setdefault("textureSize", None)
+        self.texture = None
+        self.textureKey = None
+        self.pointCache = None #see render_frames
+        self.framePool = None
+        self.frameChunks = 1
+        self.keepProjections = True #False in render_frames
         
-        self.set_matrices(self.xAngle+90, self.zAngle)
-            #The values for the matrices mean that the angles can be  
-            #understood as latitude and longitude (increasing Westwards)
+        self.set_angles(self.xAngle, self.zAngle)
             
         self.ySize = int(self.xSize * self.imageRatio)
         self.xSeed = self.seed[0]
@@ -83,6 +198,13 @@ class RiemannIteration():
     def get_contour_colour(self, i):
         return self.contourColours[i%len(self.contourColours)]
 
+    def set_angles(self, xAngle, zAngle):
+        self.xAngle = xAngle
+        self.zAngle = zAngle
+        self.set_matrices(self.xAngle+90, self.zAngle)
+            #The values for the matrices mean that the angles can be  
+            #understood as latitude and longitude (increasing Westwards)
+
     def set_matrices(self, xAngle, zAngle):
         self.x_rot = matrix_3x3()
         self.z_rot = matrix_3x3()
@@ -95,74 +217,222 @@ class RiemannIteration():
         print("x angle", self.xAngle, "z angle", self.zAngle)
         print("Size =", self.xSize, "x", self.ySize)        
 
+        self.compute()
+        self.output_image()
+
+        print("Runtime =", datetime.now() - startTime)
+
+    def compute(self):
         #Initialise array
         self.iArray = ones((self.ySize, self.xSize, 3), dtype=uint8)
 
         #Perform iteration
         self.traverse_array(self.xSize, self.ySize)
-        
+        return self.iArray
+
+    def output_image(self):
         im = Image.fromarray(self.iArray)
         if self.showImage:
             im.show()
         if self.saveImage:
             self.save_image(im)
 
+    def render_frames(self, angles, processes=1, animate=False, duration=100):
+        #Render a frame for each (xAngle, zAngle) in angles. They are saved 
+        #as fileName_0000.png etc. or, if animate, all in fileName.gif 
+        #(duration: ms per frame). Only points of the plane not seen in an 
+        #earlier frame are iterated (shared out amongst a pool of processes).
+        startTime = datetime.now()
+        angles0 = self.xAngle, self.zAngle
+        if self.textureSize:
+            #(then each frame is only a lookup)
+            self.get_texture()
+            processes = 1
+        pool = Pool(processes, initializer=init_frame_worker, 
+                    initargs=(self,)) if processes > 1 else None
+        self.framePool = pool
+        self.frameChunks = 4*processes
+        self.pointCache = None if self.textureSize else PointCache()
+        #(each view is seen only once)
+        self.keepProjections = False
+        try:
+            images = self.frame_images(angles)
+            if animate:
+                image = next(images)
+                image.save(self.fileDir + "/" + self.fileName + ".gif",
+                           save_all=True, append_images=images, 
+                           duration=duration, loop=0)
+            else:
+                for n, image in enumerate(images):
+                    image.save(self.fileDir + "/" + self.fileName 
+                               + "_{:04d}.png".format(n), format="PNG")
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+            cache = self.pointCache
+            self.framePool = self.pointCache = None
+            self.keepProjections = True
+            self.set_angles(*angles0)
+        print("Frames:", len(angles))
+        if cache is not None:
+            print("Points iterated:", cache.iterated, "of", cache.looked)
         print("Runtime =", datetime.now() - startTime)
 
+    def frame_images(self, angles):
+        #The image for each frame, as it is computed
+        for xAngle, zAngle in angles:
+            self.set_angles(xAngle, zAngle)
+            yield Image.fromarray(self.compute())
+        #end_for
+
+    def frame_colours(self, xMap, yMap):
+        #As colour_points, shared out amongst the processes of render_frames
+        if self.framePool is None:
+            return self.colour_points(xMap, yMap)
+        chunks = [chunk for chunk in np.array_split(np.arange(xMap.size), 
+                                                    self.frameChunks)
+                  if chunk.size > 0]
+        return np.concatenate(self.framePool.map(
+                   colour_chunk, [(xMap[c], yMap[c]) for c in chunks]))
+
     def traverse_array(self, xSize, ySize):
-        #Determine increase per pixel
-        xIncr = (2/xSize)
-        yIncr = (2/ySize)
-        
-        x = -1
-        for self.xPixel in range(xSize):
-            y = -1
-            for self.yPixel in range(ySize):
-                #Initialise pixel
-                hypSq = x*x + y*y
-                colour = self.defColour
-                #Is it outside unit circle?
-                if hypSq > 1:
-                    self.iArray[self.yPixel, self.xPixel] = colour
-                    y += yIncr
-                    continue
-                #Otherwise...
-                xMap, yMap, gtCircle = self.mapping(x, y)
-                #Will we draw great circle here?
-                if gtCircle and self.showGtCircles:
-                    colour = self.lineColour
-                else:
-                    #for MBrot, iterate(z, c)
-                    colour = self.iterate(self.xSeed, self.ySeed,
-                                          xMap, yMap,
-                                          self.setColour,
-                                          self.maxIter, self.limit)
-                #end_if
-                self.iArray[(self.ySize -1 -self.yPixel), self.xPixel] = colour
-                y += yIncr
-            #end_for_y    
-            x += xIncr
-        #end_for_x
+        xMap, yMap, inDisc, gtCircle = self.get_projection(xSize, ySize)
+        #Outside unit circle
+        self.iArray[~inDisc] = self.defColour
+        #Will we draw great circle here?
+        if self.showGtCircles:
+            self.iArray[gtCircle] = self.lineColour
+            toDo = inDisc & ~gtCircle
+        else:
+            toDo = inDisc
+        if self.textureSize:
+            self.iArray[toDo] = self.texture_lookup(xMap[toDo], yMap[toDo])
+        elif self.pointCache is not None:
+            self.iArray[toDo] = self.pointCache.colours_for(
+                                    xMap[toDo], yMap[toDo], self.frame_colours)
+        else:
+            self.iArray[toDo] = self.colour_points(xMap[toDo], yMap[toDo])
         return
 
+    def colour_points(self, xMap, yMap):
+        #The colour for each point (xMap[n], yMap[n]) in the plane
+        if self.vectorise:
+            #for MBrot, iterate_array(z, c)
+            index = self.iterate_array(self.xSeed, self.ySeed, xMap, yMap,
+                                       self.maxIter, self.limit)
+            if index is not None:
+                return self.colour_index(index)
+        colours = np.empty((xMap.size, 3), dtype=uint8)
+        for n in range(xMap.size):
+            #for MBrot, iterate(z, c)
+            colours[n] = self.iterate(self.xSeed, self.ySeed, 
+                                      xMap[n], yMap[n], self.setColour,
+                                      self.maxIter, self.limit)
+        #end_for_n
+        return colours
+
+    def get_texture(self):
+        #Colours for the whole sphere: rows of latitude from North to South,
+        #columns of longitude from -pi. Computed at the centre of each 
+        #texel (so not at the poles), kept until something changes.
+        key = (self.textureSize, self.maxIter, self.limit, 
+               self.xSeed, self.ySeed, self.palette)
+        if self.texture is None or key != self.textureKey:
+            rows, columns = self.textureSize, 2*self.textureSize
+            latitude = pi/2 - (np.arange(rows) + 0.5)*pi/rows
+            longitude = (np.arange(columns) + 0.5)*2*pi/columns - pi
+            longitude, latitude = np.meshgrid(longitude, latitude)
+            #Project from the top of the sphere to the plane
+            top = 1 - sin(latitude)
+            x = cos(latitude)*cos(longitude)/top
+            y = cos(latitude)*sin(longitude)/top
+            self.texture = self.colour_points(x.ravel(), y.ravel()
+                                              ).reshape(rows, columns, 3)
+            self.textureKey = key
+        return self.texture
+
+    def texture_lookup(self, x, y):
+        #Colours for points in the plane, from the nearest texel
+        texture = self.get_texture()
+        rows, columns = texture.shape[:2]
+        rSq = x*x + y*y
+        latitude = np.arcsin((rSq - 1)/(rSq + 1))
+        longitude = np.arctan2(y, x)
+        row = np.clip(((pi/2 - latitude)*rows/pi).astype(int), 0, rows - 1)
+        column = ((longitude + pi)*columns/(2*pi)).astype(int) % columns
+        return texture[row, column]
+
+    def get_projection(self, xSize, ySize):
+        #The mapping of the image onto the plane, see mapping(). Computed 
+        #once for each view, rows from the top of the image, and kept 
+        #(unless keepProjections is False).
+        key = (self.xAngle, self.zAngle, xSize, ySize)
+        projection = self.projections.get(key)
+        if projection is None:
+            #Determine increase per pixel
+            xIncr = (2/xSize)
+            yIncr = (2/ySize)
+            x = -1 + np.arange(xSize)*xIncr
+            y = (-1 + np.arange(ySize)*yIncr)[::-1]
+            x, y = np.meshgrid(x, y)
+            inDisc = x*x + y*y <= 1
+            xMap, yMap, gtCircle = self.mapping(x[inDisc], y[inDisc])
+            projection = (np.zeros((ySize, xSize)), np.zeros((ySize, xSize)),
+                          inDisc, np.zeros((ySize, xSize), dtype=bool))
+            projection[0][inDisc] = xMap
+            projection[1][inDisc] = yMap
+            projection[3][inDisc] = gtCircle
+            if self.keepProjections:
+                self.keep_projection(key, projection)
+        return projection
+
+    def keep_projection(self, key, projection):
+        #Add to projections, forgetting the oldest to stay within 
+        #MAX_PROJECTION_BYTES
+        size = sum(a.nbytes for a in projection)
+        if size > self.MAX_PROJECTION_BYTES:
+            return
+        used = sum(a.nbytes for p in self.projections.values() for a in p)
+        while self.projections and used + size > self.MAX_PROJECTION_BYTES:
+            oldest = next(iter(self.projections))
+            used -= sum(a.nbytes for a in self.projections.pop(oldest))
+        #end_while
+        self.projections[key] = projection
+
+    def get_rotation(self):
+        #The two rotations as one numpy matrix (taken from their effect on
+        #the unit vectors)
+        columns = [self.z_rot.matrix_v_multiply(
+                   self.x_rot.matrix_v_multiply(v)) 
+                   for v in ([1, 0, 0], [0, 1, 0], [0, 0, 1])]
+        return np.array(columns, dtype=np.float64).T
+
     def mapping(self, x, y):
+        #x and y are arrays of points in the unit circle
         LINE_GRADE = 0.003 #used for great circles
-        greatCircle = False
-        z = - (1 - (x*x + y*y))**(0.5)
-        v = [x, y, z] # coords on sphere
-        v = self.x_rot.matrix_v_multiply(v)
-        v = self.z_rot.matrix_v_multiply(v)
-        if v[2] == 1:
-            x, y = 0, 0
-        else:
-            x = v[0]/(1-v[2])
-            y = v[1]/(1-v[2])
-            if abs(v[0]) < LINE_GRADE \
-               or abs(v[1]) < LINE_GRADE \
-                  or abs(v[2]) < LINE_GRADE:
-                      greatCircle = True
+        z = - np.sqrt(1 - (x*x + y*y))
+        v = self.get_rotation() @ np.array([x, y, z]) # coords on sphere
+        top = v[2] == 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(top, 0, v[0]/(1-v[2]))
+            y = np.where(top, 0, v[1]/(1-v[2]))
+        greatCircle = ~top & ((abs(v[0]) < LINE_GRADE)
+                              | (abs(v[1]) < LINE_GRADE)
+                              | (abs(v[2]) < LINE_GRADE))
         return x, y, greatCircle
 
+    def iterate_array(self, x1, y1, x2, y2, maxIter, limit):
+        #Vectorised iterate: returns, for each point, the index of its colour
+        #in the palette, -1 for the set colour. None if not available.
+        return None
+
+    def colour_index(self, index):
+        #Colours for the result of iterate_array
+        table = np.array(self.contourColours + [self.setColour], dtype=uint8)
+        return table[np.where(index < 0, len(self.contourColours), 
+                              index % len(self.contourColours))]
+
     def iterate(self, x1, y1, x2, y2, colour, maxIter, limit):
         return self.defColour
 
@@ -195,8 +465,34 @@ class MbrotRIter(RiemannIteration):
 
     ------------------------------------------------------------
     """
+    def __init__(self, **kwargs):
+        self.interiorCheck = kwargs.setdefault("interiorCheck", True)
+        super().__init__(**kwargs)
+
+    def iterate_array(self, x1, y1, x2, y2, maxIter, limit):
+        index = np.full(np.shape(x2), -1)
+        toDo = np.ones(np.shape(x2), dtype=bool)
+        if self.interiorCheck and x1 == 0 and y1 == 0:
+            toDo = ~in_main_bulbs(x2, y2)
+        index[toDo] = escape_count(self.function, x1, y1, x2[toDo], y2[toDo],
+                                   maxIter, limit)
+        return index
+
+    def function(self, x, y, cr, ci):
+        #Compute z**2 + c, as in iterate (the test is on the new |z|**2)
+        xSq = x*x
+        ySq = y*y
+        y = x*y
+        y = y + y + ci
+        x = xSq - ySq + cr
+        return x, y, (x*x + y*y)
+
     #Old version
     def iterate(self, x1, y1, x2, y2, colour, maxIter, limit):
+        #Cardioid and bulb never escape (when z0 = 0)
+        if self.interiorCheck and x1 == 0 and y1 == 0 \
+           and in_main_bulbs(x2, y2):
+            return colour
         x_sq = x1*x1
         y_sq = y1*y1
         d_sq = x_sq + y_sq
@@ -236,6 +532,13 @@ class MbrotRRealPower(RiemannIteration):
         #end_for_i
         return colour
 
+    def iterate_array(self, x1, y1, x2, y2, maxIter, limit):
+        #Only if compiled (module kernels), otherwise iterate is used
+        if not JIT:
+            return None
+        return compiled_count(real_power_count, x1, y1, x2, y2,
+                              float(self.zPower), maxIter, float(limit))
+
 
 class NRCubeRoot1(RiemannIteration):
     """
@@ -329,6 +632,12 @@ class NRComplexRoot(RiemannIteration):
                     if abs(zPolar.val_angle() - j*self.testAngle) < limit:
                         return j + 1
         return 0
+
+    def iterate_array(self, xSeed, ySeed, x, y, maxIter, limit):
+        count, root = newton_roots_of_one(x, y, self.power, maxIter, limit)
+        if self.showBasins == True:
+            return np.where(root > 0, root, -1)
+        return count
     
     def iterate(self, xSeed, ySeed, x, y, colour, maxIter, limit):
         #Find roots of 1 using Newton's method
@@ -378,3 +687,8 @@ if __name__ == "__main__":
         myIter = NRComplexRoot(8, xAngle=-30, zAngle=0, maxIter=60,
                                limit=0.01)
         myIter.run()
+    if tc==5:
+        myIter = MbrotRIter(xSize=300, palette = "3CAL_0", 
+                            fileName="rimage")
+        myIter.render_frames(angle_path((0, 0), (0, 360), 73), processes=4,
+                             animate=True)
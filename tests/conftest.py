@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The programs are a flat set of modules in the directory above; those they
+share with other projects (myColour, myMathOO, myMatrices) are looked for in
+../modules, as the programs themselves do. Tests which need those are
+skipped where they are not installed.
+@author: Owner
+"""
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in (root, os.path.join(os.path.dirname(root), "modules")):
+    if directory not in sys.path:
+        sys.path.append(directory)
+
+import pytest
+
+@pytest.fixture
+def no_show(monkeypatch):
+    #The programs show each image (PIL), not wanted here; and plots are 
+    #drawn without a display
+    pytest.importorskip("matplotlib").use("Agg")
+    from PIL import Image
+    monkeypatch.setattr(Image.Image, "show", lambda self, *args: None)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Adaptive sampling of k for the Feigenbaum diagrams (Feigenbaum.adaptive_k):
+more values of k where the period of p changes or none is found, one per
+step elsewhere, and the image as before when there are no more to give.
+@author: Owner
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib").use("Agg")
+from feigenbaum import Feigenbaum, orbit_period
+
+def test_orbit_period():
+    k = np.array([1.8, 2.3, 2.5, 2.55, 2.9])
+    f = Feigenbaum()
+    p = np.full(k.size, 0.3)
+    tail = np.empty((64, k.size))
+    for i in range(2000 + 64):
+        p = f.function(p, k)
+        if i >= 2000:
+            tail[i - 2000] = p
+    #end_for_i
+    assert list(orbit_period(tail)) == [1, 2, 4, 8, 0]
+    tail[:, 0] = np.inf
+    assert orbit_period(tail)[0] == -1
+
+def test_adaptive_k():
+    f = Feigenbaum(kStart=1.6, kEnd=3.0, maxIter=200, adaptive=True)
+    f.kRes = 200
+    kIncr = (f.kEnd - f.kStart)/f.kRes
+    k, refined = f.adaptive_k(kIncr)
+    assert np.all(np.diff(k) > 0)
+    assert k.size <= 4*f.kRes and k.size > 2*f.kRes
+    #Every step's own k is there
+    plain = np.add.accumulate(np.r_[f.kStart, np.full(f.kRes - 1, kIncr)])
+    assert np.isin(plain, k).all()
+    #None refined where p soon settles to one point, most in the chaos
+    assert not refined[k < 1.8].any()
+    assert refined[k > 2.6].mean() > 0.9
+    assert np.count_nonzero(k > 2.6) > 2*np.count_nonzero(plain > 2.6)
+
+def test_no_extra_samples(no_show):
+    #With kSamples = kRes every step has one k: the image of a plain run
+    kwargs = {"kStart": 1.6, "kEnd": 3.0, "maxIter": 200, "ignore": 50}
+    plain = Feigenbaum(**kwargs)
+    plain.image(xSize=200, ySize=150)
+    adaptive = Feigenbaum(adaptive=True, kSamples=200, **kwargs)
+    adaptive.image(xSize=200, ySize=150)
+    assert (adaptive.myArray == plain.myArray).all()
+
+def test_adaptive_image(no_show):
+    #More of the chaotic region is drawn; the rest is as before
+    kwargs = {"kStart": 1.6, "kEnd": 3.0, "maxIter": 200, "ignore": 50}
+    plain = Feigenbaum(**kwargs)
+    plain.image(xSize=200, ySize=150)
+    adaptive = Feigenbaum(adaptive=True, refineIter=2, **kwargs)
+    adaptive.image(xSize=200, ySize=150)
+    drawn = lambda f: (f.myArray != 1).any(axis=2)
+    assert np.count_nonzero(drawn(adaptive)) \
+           > 1.5*np.count_nonzero(drawn(plain))
+    columns = slice(0, 28) #(k < 1.8)
+    assert (drawn(adaptive)[:, columns] == drawn(plain)[:, columns]).all()
+
+def test_no_checkpoint(tmp_path, no_show):
+    with pytest.raises(ValueError):
+        Feigenbaum(adaptive=True, checkpoint=str(tmp_path/"f.npz")).image()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The analysis of the Feigenbaum maps (Feigenbaum.analyse, 
+bifurcation_points, delta_estimates, lyapunov_image) against known values.
+p := p + k*p*(1-p) is the logistic map with r = k + 1, so its period 
+doublings are at k = 2, sqrt(6), 2.5440903..., and at k = 3 (r = 4) the 
+Lyapunov exponent is log(2).
+@author: Owner
+"""
+from math import log, sqrt
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib").use("Agg")
+from feigenbaum import Feigenbaum, Feig2, cascade, feigenbaum_delta
+
+DELTA = 4.6692016
+
+def test_lyapunov():
+    k, lyapunov, period = Feigenbaum().analyse([1.8, 2.3, 2.5, 3.0])
+    assert (lyapunov[:3] < 0).all()
+    assert lyapunov[3] == pytest.approx(log(2), abs=0.02)
+    assert list(period) == [1, 2, 4, 0]
+
+def test_bifurcation_points():
+    points, q = Feigenbaum().bifurcation_points(np.linspace(1.9, 2.56, 
+                                                            8000))
+    first = cascade(points, q)
+    assert list(q[:3]) == [1, 2, 4]
+    assert first[:3] == pytest.approx([2, sqrt(6), 2.5440903], abs=1e-6)
+
+def test_delta_estimates():
+    delta, points = Feigenbaum().delta_estimates(np.linspace(1.9, 2.58, 
+                                                             20000))
+    assert len(points) >= 5
+    assert delta[-1] == pytest.approx(DELTA, rel=0.01)
+    #(better as they go on)
+    assert abs(delta[-1] - DELTA) < abs(delta[0] - DELTA)
+
+def test_cascade():
+    #The first cascade, whatever else is found on the way
+    points = [3.0, 1.0, 2.0, 2.5, 2.7, 2.9]
+    periods = [3, 1, 2, 4, 6, 8]
+    assert list(cascade(points, periods)) == [1.0, 2.0, 2.5, 2.9]
+    assert feigenbaum_delta([1.0, 2.0, 2.5]) == pytest.approx([2.0])
+
+def test_other_map():
+    #Feig2 with its own function and derivative: a period doubling where 
+    #the multiplier of its cycle is -1
+    f = Feig2()
+    points, q = f.bifurcation_points(np.linspace(4.5, 6.5, 4000))
+    assert points.size > 0
+    for point, cycle in zip(points, q):
+        assert f.doubling_test(np.array([point]), np.array([cycle]))[0] \
+               == pytest.approx(0, abs=1e-3)
+    #end_for_point
+
+def test_lyapunov_image(no_show):
+    f = Feigenbaum(kStart=1.6, kEnd=3.0)
+    f.lyapunov_image(xSize=140, ySize=10)
+    assert f.myArray.shape == (10, 140, 3)
+    assert (f.myArray == f.myArray[0]).all()
+    #colour0 where periodic (k < 2), colour1 in the chaos at the end
+    colour0 = np.array(f.colour0) > 0
+    colour1 = np.array(f.colour1) > 0
+    assert ((f.myArray[0, :30] > 0) <= colour0).all()
+    assert ((f.myArray[0, -5:] > 0) == colour1).all()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The headless batch renderer (batch.py): each job gives the image that its
+iteration renders, and the command line reads jobs from a json file.
+@author: Owner
+"""
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from PIL import Image
+
+pytest.importorskip("tkinter")
+pytest.importorskip("myColour")
+pytest.importorskip("myMathOO")
+import generic
+import batch
+
+JOBS = [{"class": "Mandelbrot", "xSize": 80, "maxIter": 50,
+         "fname": "m.png"},
+        {"class": "NComplexRoot", "args": [5], "xSize": 60},
+        {"class": "NoSuchIteration"}]
+
+def test_render_jobs(tmp_path):
+    batch.render_jobs(JOBS, str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["NComplexRoot_001.png", "m.png"]
+    expected = generic.Mandelbrot(None, xSize=80, maxIter=50).render()
+    assert (np.array(Image.open(tmp_path/"m.png")) == expected).all()
+    expected = generic.NComplexRoot(None, 5, xSize=60).render()
+    assert (np.array(Image.open(tmp_path/"NComplexRoot_001.png"))
+            == expected).all()
+
+def test_command_line(tmp_path):
+    jobs = tmp_path/"jobs.json"
+    jobs.write_text(json.dumps(JOBS[:1]))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, batch.__file__, str(jobs),
+                    "--dir", str(tmp_path)], check=True, env=environment,
+                   capture_output=True)
+    assert (tmp_path/"m.png").exists()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Checkpoints (module checkpoint): saved and loaded as they were, and a run
+carried on from one gives the image of a run done in one go.
+@author: Owner
+"""
+import numpy as np
+import pytest
+from checkpoint import save_checkpoint, load_checkpoint
+
+def test_round_trip(tmp_path):
+    fname = str(tmp_path/"state.npz")
+    parameters = {"class": "Henon", "constants": (1.4, np.float64(0.3)),
+                  "size": [600, 400], "density": False}
+    arrays = {"x": np.linspace(0, 1, 7), "steps": np.array(1234),
+              "image": np.arange(24, dtype=np.uint8).reshape(2, 4, 3)}
+    save_checkpoint(fname, parameters, **arrays)
+    state = load_checkpoint(fname, parameters)
+    assert set(state) == set(arrays)
+    for name, array in arrays.items():
+        assert state[name].dtype == array.dtype
+        assert (state[name] == array).all()
+
+def test_different_parameters(tmp_path):
+    fname = str(tmp_path/"state.npz")
+    save_checkpoint(fname, {"seed": [0, 0], "ignore": 40}, x=np.zeros(1))
+    with pytest.raises(ValueError, match="ignore"):
+        load_checkpoint(fname, {"seed": [0, 0], "ignore": 50})
+
+def resumed(cls, fname, parts, **kwargs):
+    #Render in parts (maxIter for each), each carrying on from the last
+    for n, maxIter in enumerate(parts):
+        run = cls(maxIter=maxIter, checkpoint=fname,
+                  resume=fname if n else None, **kwargs)
+        run.image(xSize=120, ySize=80)
+    #end_for
+    return run
+
+@pytest.mark.parametrize("density", [False, True])
+@pytest.mark.parametrize("name, kwargs", [("Henon", {}), 
+                                          ("Orbiter", {"kicks": 10})])
+def test_resume_henon(tmp_path, no_show, density, name, kwargs):
+    import henon
+    cls = getattr(henon, name)
+    full = cls(maxIter=5000, density=density, **kwargs)
+    full.image(xSize=120, ySize=80)
+    run = resumed(cls, str(tmp_path/"henon.npz"), [7, 1000, 5000],
+                  density=density, **kwargs)
+    assert (run.myArray == full.myArray).all()
+    if density:
+        assert (run.histogram == full.histogram).all()
+
+@pytest.mark.parametrize("density", [False, True])
+def test_resume_feigenbaum(tmp_path, no_show, density):
+    from feigenbaum import Feigenbaum
+    full = Feigenbaum(maxIter=200, ignore=20, density=density)
+    full.image(xSize=120, ySize=80)
+    run = resumed(Feigenbaum, str(tmp_path/"feigenbaum.npz"), [10, 30, 200],
+                  ignore=20, density=density)
+    assert (run.myArray == full.myArray).all()
+
+def test_resume_fewer_iterations(tmp_path, no_show):
+    #maxIter may not go back below what the checkpoint has done
+    from feigenbaum import Feigenbaum
+    fname = str(tmp_path/"feigenbaum.npz")
+    resumed(Feigenbaum, fname, [100], ignore=20)
+    with pytest.raises(ValueError, match="maxIter"):
+        resumed(Feigenbaum, fname, [100, 50], ignore=20)
+    from henon import Henon
+    fname = str(tmp_path/"henon.npz")
+    resumed(Henon, fname, [100])
+    with pytest.raises(ValueError, match="maxIter"):
+        resumed(Henon, fname, [100, 50])
+
+def test_resume_other_view(tmp_path, no_show):
+    #A checkpoint is only carried on from with the same parameters
+    from feigenbaum import Feigenbaum
+    fname = str(tmp_path/"feigenbaum.npz")
+    resumed(Feigenbaum, fname, [100], ignore=20)
+    with pytest.raises(ValueError, match="ignore"):
+        Feigenbaum(maxIter=200, ignore=30, resume=fname).image(xSize=120, 
+                                                               ySize=80)
+    with pytest.raises(ValueError, match="size"):
+        Feigenbaum(maxIter=200, ignore=20, resume=fname).image(xSize=100, 
+                                                               ySize=80)
+    with pytest.raises(ValueError, match="vectorise"):
+        Feigenbaum(maxIter=200, ignore=20, resume=fname, 
+                   vectorise=False).image(xSize=120, ySize=80)
+
+def test_resume_after_overflow(tmp_path, no_show):
+    #Values of k whose p overflowed in an earlier part are not in the 
+    #checkpoint; the rest carry on as in one run
+    from feigenbaum import Feig2
+    view = {"ignore": 5, "kStart": 4.5, "kEnd": 7.5, "yMin": -2, "yMax": 3}
+    full = Feig2(maxIter=60, **view)
+    full.image(xSize=120, ySize=80)
+    run = resumed(Feig2, str(tmp_path/"feig2.npz"), [10, 18, 30, 60], **view)
+    assert run.kRes > len(np.load(str(tmp_path/"feig2.npz"))["k"])
+    assert (run.myArray == full.myArray).all()
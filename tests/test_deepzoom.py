@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Deep zoom by perturbation (module deepzoom) against plain float64, at a
+zoom where float64 still tells the pixels apart. Points whose orbits come
+close to the boundary of the set for many iterations are sensitive to the
+rounding of float64, so a few pixels may differ.
+@author: Owner
+"""
+from decimal import Decimal
+import numpy as np
+import pytest
+from kernels import escape_count
+from deepzoom import reference_orbit, deep_count
+from deepzoom import exact_count, point, perturbation_count
+import deepzoom
+from test_vectorise import square
+
+REFERENCE = (Decimal("-0.743643887"), Decimal("0.131825904"))
+WIDTH = 1e-6
+MAX_ITER = 1000
+LIMIT = 4
+PRECISION = 40
+
+def view(size=64):
+    offsets = np.linspace(-WIDTH/2, WIDTH/2, size)
+    return (offsets[np.newaxis, :] + 1j*offsets[:, np.newaxis]).ravel()
+
+def float_count(dc):
+    return escape_count(square, 0, 0, float(REFERENCE[0]) + dc.real,
+                        float(REFERENCE[1]) + dc.imag, MAX_ITER, LIMIT)
+
+def check(count, expected):
+    assert np.count_nonzero(count != expected) <= 0.01*count.size
+    assert np.unique(expected).size > 100 #(an interesting view)
+
+def test_deep_count():
+    dc = view()
+    orbit = reference_orbit(*REFERENCE, 0, 0, MAX_ITER, LIMIT, PRECISION)
+    count = deep_count(dc, REFERENCE, orbit, 0, 0, MAX_ITER, LIMIT,
+                       PRECISION)
+    check(count, float_count(dc))
+
+def test_kept_references():
+    #A second call, with the references made by the first, gives the same
+    dc = view(32)
+    orbit = reference_orbit(*REFERENCE, 0, 0, MAX_ITER, LIMIT, PRECISION)
+    references = []
+    first = deep_count(dc, REFERENCE, orbit, 0, 0, MAX_ITER, LIMIT,
+                       PRECISION, references=references)
+    kept = len(references)
+    assert kept > 0 #(the view has glitches)
+    again = deep_count(dc, REFERENCE, orbit, 0, 0, MAX_ITER, LIMIT,
+                       PRECISION, references=references)
+    assert (first == again).all()
+    assert len(references) == kept
+
+def test_exact_count():
+    #The Decimal fallback, for single points
+    dc = view(8)
+    count = [exact_count(*point(REFERENCE, d, PRECISION), 0, 0, MAX_ITER,
+                         LIMIT, PRECISION) for d in dc]
+    assert np.count_nonzero(np.array(count) != float_count(dc)) <= 1
+
+def test_no_glitch_left(monkeypatch):
+    #With no new references allowed, glitched points are done by 
+    #exact_count
+    monkeypatch.setattr(deepzoom, "MAX_REFERENCES", 0)
+    dc = view(32)
+    orbit = reference_orbit(*REFERENCE, 0, 0, MAX_ITER, LIMIT, PRECISION)
+    glitched = np.flatnonzero(perturbation_count(dc, orbit, MAX_ITER, 
+                                                 LIMIT)[1])
+    assert glitched.size > 0
+    count = deep_count(dc, REFERENCE, orbit, 0, 0, MAX_ITER, LIMIT, 
+                       PRECISION)
+    for n in glitched:
+        assert count[n] == exact_count(*point(REFERENCE, dc[n], PRECISION),
+                                       0, 0, MAX_ITER, LIMIT, PRECISION)
+    #end_for_n
+
+def test_generic_deep_zoom():
+    #Mandelbrot with deepZoom, at a width float64 still resolves
+    pytest.importorskip("tkinter")
+    pytest.importorskip("myColour")
+    pytest.importorskip("myMathOO")
+    import generic
+    view = {"xStart": -0.7436443870, "xEnd": -0.7436433870,
+            "yStart": 0.1318255290}
+    plain = generic.Mandelbrot(None, xSize=96, maxIter=1000, 
+                               periodTolerance=0, **view)
+    plain.render()
+    deep = generic.Mandelbrot(None, xSize=96, maxIter=1000, deepZoom=True,
+                              **{name: str(value) 
+                                 for name, value in view.items()})
+    deep.render()
+    check(deep.result["count"].ravel(), plain.result["count"].ravel())
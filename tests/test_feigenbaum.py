@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The vectorised bifurcation diagrams (Feigenbaum.traverse_k_array) against
+the loop over k, one value at a time (vectorise False): the same image, 
+including where a pixel is hit more than once and where p overflows.
+@author: Owner
+"""
+import pytest
+
+@pytest.mark.parametrize("name, kwargs, size", [
+    ("Feigenbaum", {"maxIter": 200, "ignore": 50}, {}),
+    ("Feigenbaum", {"kStart": 3.0, "kEnd": 1.6}, {}),
+    ("Feig2", {"ignore": 5, "maxIter": 60, "kStart": 4.5, "kEnd": 7.06, 
+               "yMin": -2, "yMax": 3}, {}),
+    ("Feig3", {"yMax": 1.8, "kEnd": 3.1}, {}),
+    ("FeigPtoFofP", {"kStart": 1.8, "kEnd": 3, "yMin": 1, "yMax": 1.4},
+     {"kRes": 100}),
+])
+def test_vectorised(no_show, name, kwargs, size):
+    import feigenbaum
+    cls = getattr(feigenbaum, name)
+    size = dict(size, xSize=300, ySize=200)
+    iteration = cls(**kwargs)
+    iteration.image(**size)
+    loop = cls(vectorise=False, **kwargs)
+    loop.image(**size)
+    assert (iteration.myArray == loop.myArray).all()
+    #(something was drawn, in both colours)
+    colours = {tuple(c) for c in iteration.myArray.reshape(-1, 3)}
+    assert {tuple(iteration.colour0), tuple(iteration.colour1)} <= colours
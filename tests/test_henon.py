@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The batched orbits of henon.py (all the orbits at once, compiled or with
+numpy) against the loop over the orbits one point at a time.
+@author: Owner
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib").use("Agg")
+import henon
+from henon import Henon, Orbiter
+
+def loop_orbits(iteration, steps):
+    #Each orbit from start_points, one step at a time with function, as
+    #rows of steps and columns of orbits
+    x0, y0 = iteration.start_points()
+    points = np.empty((steps, x0.size, 2))
+    for n in range(x0.size):
+        x, y = float(x0[n]), float(y0[n])
+        for i in range(steps):
+            points[i, n] = x, y
+            retcode, x, y = iteration.function(iteration.constants, x, y)
+        #end_for_i
+    #end_for_n
+    return points
+
+@pytest.mark.parametrize("jit", [True, False])
+@pytest.mark.parametrize("cls, kwargs", [(Henon, {}), (Orbiter, {})])
+def test_orbit_steps(monkeypatch, jit, cls, kwargs):
+    #Compiled, or numpy if not. (Orbits which diverge, as some Orbiter 
+    #orbits do, end in nan in both.)
+    monkeypatch.setattr(henon, "JIT", jit and henon.JIT)
+    iteration = cls(**kwargs)
+    xs, ys, x, y = iteration.orbit_steps(*iteration.start_points(), 300)
+    expected = loop_orbits(iteration, 301)
+    assert np.allclose(np.stack((xs, ys), axis=-1), expected[:-1],
+                       rtol=1e-12, atol=1e-12, equal_nan=True)
+    assert np.allclose(np.stack((x, y), axis=-1), expected[-1], 
+                       rtol=1e-12, atol=1e-12, equal_nan=True)
+
+@pytest.mark.parametrize("cls, kwargs", [
+    (Henon, {"maxIter": 5000}),
+    (Orbiter, {"kicks": 20, "maxIter": 300}),
+    #(orbits which diverge are dropped)
+    (Orbiter, {"kicks": 20, "maxIter": 300, "dx": 0.1, "dy": 0.1}),
+])
+def test_vectorised(no_show, cls, kwargs):
+    iteration = cls(**kwargs)
+    iteration.image(xSize=300, ySize=200)
+    loop = cls(vectorise=False, **kwargs)
+    loop.image(xSize=300, ySize=200)
+    assert (iteration.myArray == loop.myArray).all()
+    assert (iteration.myArray != loop.myArray[0, 0]).any()
+
+def test_no_kicks():
+    with pytest.raises(ValueError):
+        Orbiter(kicks=0)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The cardioid and period-2 bulb test (kernels.in_main_bulbs): the same for
+arrays as for single numbers, and the points it finds do not escape.
+@author: Owner
+"""
+import numpy as np
+import pytest
+from kernels import escape_count, in_main_bulbs
+from test_vectorise import square, plane, per_point
+
+def test_in_main_bulbs():
+    x, y = plane(xSize=101, ySize=81)
+    inside = in_main_bulbs(x, y)
+    expected = per_point(x, y, in_main_bulbs)
+    assert (inside == expected).all()
+    assert inside.any() and not inside.all()
+    count = escape_count(square, 0, 0, *np.broadcast_arrays(x, y), 1000, 4)
+    assert (count[inside] == -1).all()
+
+def test_interior_check():
+    #Mandelbrot's image is the same with the check on or off
+    pytest.importorskip("tkinter")
+    pytest.importorskip("myColour")
+    pytest.importorskip("myMathOO")
+    import generic
+    checked = generic.Mandelbrot(None, xSize=96, periodTolerance=0)
+    image = checked.render()
+    unchecked = generic.Mandelbrot(None, xSize=96, periodTolerance=0,
+                                   interiorCheck=False)
+    assert (unchecked.render() == image).all()
+    assert (unchecked.result == checked.result).all()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The Newton kernel for the nth roots of one (kernels.newton_roots_of_one, 
+root_of_one) against one point at a time, and the classes using it 
+(generic.NComplexRoot, riemann.NRComplexRoot) against their per-pixel 
+iterate.
+@author: Owner
+"""
+import cmath
+from math import pi
+import numpy as np
+import pytest
+from kernels import root_of_one, newton_roots_of_one
+from test_vectorise import plane, per_point, generic_classes
+
+def root_of_one_at(z, n, limit):
+    #Which nth root of one is z close to, trying each in turn
+    for j in range(n):
+        angle = cmath.phase(z) - 2*pi*j/n
+        angle = (angle + pi) % (2*pi) - pi
+        if abs(abs(z) - 1) < limit and abs(angle) < limit:
+            return j + 1
+    #end_for_j
+    return 0
+
+def newton_one(z, n, maxIter, limit):
+    #(iteration, root) for one point, or (-1, 0)
+    if z == 0:
+        return -1, 0
+    for i in range(maxIter):
+        z = z - (z**n - 1)/(n*z**(n - 1))
+        root = root_of_one_at(z, n, limit)
+        if root:
+            return i, root
+    #end_for_i
+    return -1, 0
+
+def test_root_of_one():
+    limit = 0.01
+    random = np.random.default_rng(1)
+    for n in (2, 3, 5, 7):
+        j = random.integers(0, n, 500)
+        angle = 2*pi*j/n + random.uniform(-2*limit, 2*limit, j.size)
+        z = (1 + random.uniform(-2*limit, 2*limit, j.size))*np.exp(1j*angle)
+        root = root_of_one(z, n, limit)
+        expected = [root_of_one_at(complex(value), n, limit) for value in z]
+        assert (root == expected).all()
+        assert (root > 0).any() and (root == 0).any()
+    #end_for_n
+
+@pytest.mark.parametrize("n", [3, 5, 8])
+def test_newton_roots_of_one(n):
+    x, y = plane(-1.5, 1.5, -1.5, 1.5, 61, 61)
+    count, root = newton_roots_of_one(x, y, n, 40, 0.005)
+    expected = per_point(x, y, lambda x, y: newton_one(complex(x, y), n, 40,
+                                                       0.005))
+    assert (count == expected[..., 0]).all()
+    assert (root == expected[..., 1]).all()
+    assert set(np.unique(root)) >= set(range(1, n + 1))
+
+@pytest.mark.parametrize("showBasins", [True, False])
+def test_generic_complex_root(showBasins):
+    generic = generic_classes()
+    image = generic.NComplexRoot(None, 5, xSize=96, 
+                                 showBasins=showBasins).render()
+    pixels = generic.NComplexRoot(None, 5, xSize=96, showBasins=showBasins,
+                                  vectorise=False).render()
+    assert (image == pixels).all()
+
+@pytest.mark.parametrize("showBasins", [True, False])
+def test_riemann_complex_root(showBasins):
+    pytest.importorskip("myMatrices")
+    pytest.importorskip("myColour")
+    pytest.importorskip("myMathOO")
+    import riemann
+    kwargs = {"xAngle": -30, "xSize": 80, "showImage": False, 
+              "showBasins": showBasins}
+    image = riemann.NRComplexRoot(5, **kwargs).compute()
+    pixels = riemann.NRComplexRoot(5, vectorise=False, **kwargs).compute()
+    assert (image == pixels).all()
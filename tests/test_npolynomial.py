@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Newton's method for any polynomial (kernels.newton_polynomial, 
+nearest_root), against one point at a time, and generic.NPolynomial with
+vectorise on and off. Where more than one root is close, the nearest is
+taken.
+@author: Owner
+"""
+import numpy as np
+import pytest
+from kernels import newton_polynomial, horner, root_table, nearest_root
+from test_vectorise import plane, per_point, generic_classes
+
+POLYNOMIALS = [[1, 0, -2, 2], [1, 0, 0, 0, 0, -1], [1, -3, 3.0001, -1.0001],
+               [2, -1j, 0, 3, 1 + 1j]]
+LIMIT = 0.0025
+
+def newton_one(z, coefficients, derivative, roots, maxIter, limit):
+    #As generic.NPolynomial.iterate: (iteration, root) or (-1, 0)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        for i in range(maxIter):
+            z = complex(z - horner(coefficients, z)/horner(derivative, z))
+            if not np.isfinite(z):
+                break
+            distance = abs(z - roots)**2
+            if distance.min() < limit:
+                return i, distance.argmin() + 1
+        #end_for_i
+    return -1, 0
+
+@pytest.mark.parametrize("coefficients", POLYNOMIALS)
+def test_nearest_root(coefficients):
+    #The grid lookup against trying every root (the nearest, if several)
+    roots = np.roots(coefficients)
+    random = np.random.default_rng(2)
+    z = roots[random.integers(0, roots.size, 2000)] \
+        + random.normal(0, 2*LIMIT**0.5, 2000) \
+        + 1j*random.normal(0, 2*LIMIT**0.5, 2000)
+    root = nearest_root(z, roots, root_table(roots, LIMIT), LIMIT)
+    distance = abs(z[:, np.newaxis] - roots[np.newaxis, :])**2
+    expected = np.where(distance.min(axis=1) < LIMIT, 
+                        distance.argmin(axis=1) + 1, 0)
+    assert (root == expected).all()
+    assert (root > 0).any() and (root == 0).any()
+
+@pytest.mark.parametrize("coefficients", POLYNOMIALS)
+def test_newton_polynomial(coefficients):
+    derivative = np.polyder(np.poly1d(coefficients)).coeffs
+    roots = np.roots(coefficients)
+    x, y = plane(-2, 2, -1.5, 1.5, 61, 47)
+    count, root = newton_polynomial(x, y, coefficients, derivative, roots,
+                                    40, LIMIT)
+    expected = per_point(x, y, lambda x, y: newton_one(complex(x, y),
+                                                       coefficients,
+                                                       derivative, roots,
+                                                       40, LIMIT))
+    assert (count == expected[..., 0]).all()
+    assert (root == expected[..., 1]).all()
+    assert (root > 0).any()
+
+@pytest.mark.parametrize("kwargs", [{}, {"showBasins": False}, 
+                                    {"coefficients": [1, 0, 0, 0, 0, -1]},
+                                    {"coefficients": [1, -3, 3.0001, 
+                                                      -1.0001]}])
+def test_generic_polynomial(kwargs):
+    generic = generic_classes()
+    iteration = generic.NPolynomial(None, xSize=96, **kwargs)
+    image = iteration.render()
+    assert iteration.resultValid
+    pixels = generic.NPolynomial(None, xSize=96, vectorise=False, 
+                                 **kwargs).render()
+    assert (image == pixels).all()
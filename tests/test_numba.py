@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The compiled kernels of module kernels (numba) against the ComplexVar 
+iterations they replace, and the fallback to those iterations when numba 
+does not import, or a kernel does not compile or run.
+@author: Owner
+"""
+import importlib.abc
+import importlib.util
+import sys
+import numpy as np
+import pytest
+import kernels
+from test_vectorise import generic_classes
+
+def no_jit():
+    if not kernels.JIT:
+        pytest.skip("numba is not installed")
+
+@pytest.mark.parametrize("name, kwargs", [
+    ("MbrotRealPower", {"zPower": 2.5, "maxIter": 60}),
+    ("MbrotRealPower", {"zPower": 2, "maxIter": 60, "seed": [0.1, 0.1]}),
+    ("MagModel1", {}),
+])
+def test_generic_compiled(name, kwargs):
+    no_jit()
+    cls = getattr(generic_classes(), name)
+    iteration = cls(None, xSize=96, **kwargs)
+    image = iteration.render()
+    assert iteration.resultValid
+    pixels = cls(None, xSize=96, vectorise=False, **kwargs).render()
+    assert (image == pixels).all()
+
+def test_riemann_compiled():
+    no_jit()
+    pytest.importorskip("myMatrices")
+    pytest.importorskip("myColour")
+    pytest.importorskip("myMathOO")
+    import riemann
+    kwargs = {"xAngle": 40, "zAngle": 70, "zPower": 2.2, "maxIter": 60,
+              "xSize": 80, "showImage": False}
+    image = riemann.MbrotRRealPower(**kwargs).compute()
+    pixels = riemann.MbrotRRealPower(vectorise=False, **kwargs).compute()
+    assert (image == pixels).all()
+
+class NoNumba(importlib.abc.MetaPathFinder):
+    #numba installed but failing as it is imported (e.g. built for another
+    #numpy)
+    def find_spec(self, name, path, target=None):
+        if name == "numba" or name.startswith("numba."):
+            raise RuntimeError("numba is broken")
+        return None
+
+def test_broken_numba(monkeypatch):
+    for name in list(sys.modules):
+        if name == "numba" or name.startswith("numba."):
+            monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setattr(sys, "meta_path", [NoNumba()] + sys.meta_path)
+    spec = importlib.util.spec_from_file_location("brokenkernels", 
+                                                  kernels.__file__)
+    copy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(copy)
+    assert not copy.JIT
+    assert copy.real_power_count is None and copy.henon_orbit is None
+    assert copy.compiled_count(copy.real_power_count, 0, 0, np.zeros(3), 
+                               np.zeros(3), 2.0, 10, 2.0) is None
+
+calls = []
+
+def fails(*args):
+    #A kernel which does not compile
+    calls.append(args)
+    raise TypeError("cannot compile")
+
+def test_failing_kernel(monkeypatch):
+    #Tried once, then not again; the callers use their own path
+    monkeypatch.setattr(kernels, "failedKernels", set())
+    calls.clear()
+    assert kernels.compiled_count(fails, 0, 0, np.zeros(3), np.zeros(3)) \
+           is None
+    assert kernels.run_compiled(fails, 1) is None
+    assert len(calls) == 1
+    generic = generic_classes()
+    expected = generic.MbrotRealPower(None, xSize=64, zPower=2.5, 
+                                      maxIter=40, vectorise=False).render()
+    monkeypatch.setattr(generic, "JIT", True)
+    monkeypatch.setattr(generic, "real_power_count", fails)
+    iteration = generic.MbrotRealPower(None, xSize=64, zPower=2.5, 
+                                       maxIter=40)
+    assert (iteration.render() == expected).all()
+    assert len(calls) == 1
+
+def test_failing_orbit_kernel(monkeypatch):
+    pytest.importorskip("matplotlib").use("Agg")
+    import henon
+    monkeypatch.setattr(kernels, "failedKernels", set())
+    iteration = henon.Henon(seed=[0.1, 0.1])
+    expected = iteration.orbit_steps(*iteration.start_points(), 50)
+    monkeypatch.setattr(henon, "JIT", True)
+    monkeypatch.setattr(henon, "henon_orbit", fails)
+    xs, ys, x, y = iteration.orbit_steps(*iteration.start_points(), 50)
+    assert np.allclose(xs, expected[0]) and np.allclose(ys, expected[1])
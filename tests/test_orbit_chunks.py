@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The orbits of henon.py in chunks (orbit_chunks): together they are the 
+orbit computed one point at a time, no chunk is larger than CHUNK_POINTS, 
+and the image, histogram and file (write_orbit) are as if done in one go.
+@author: Owner
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib").use("Agg")
+import henon
+from henon import Henon, Orbiter
+from test_henon import loop_orbits
+
+@pytest.mark.parametrize("cls, kwargs", [(Henon, {}),
+                                         (Orbiter, {"kicks": 5})])
+def test_orbit_chunks(monkeypatch, tmp_path, cls, kwargs):
+    #Small chunks, so that there are several
+    monkeypatch.setattr(henon, "CHUNK_POINTS", 64)
+    iteration = cls(**kwargs)
+    steps = 500
+    expected = loop_orbits(iteration, steps)
+    chunks = list(iteration.orbit_chunks(steps))
+    assert len(chunks) > 1
+    assert all(xs.size <= 64 for start, xs, ys in chunks)
+    assert [start for start, xs, ys in chunks] \
+           == list(np.cumsum([0] + [len(xs) for start, xs, ys in chunks])[:-1])
+    points = np.concatenate([np.stack((xs, ys), axis=-1)
+                             for start, xs, ys in chunks])
+    assert np.allclose(points, expected, rtol=1e-12, atol=1e-12)
+    #write_orbit writes the same points, step by step
+    fname = str(tmp_path/"orbit.bin")
+    iteration.write_orbit(fname, steps)
+    written = np.fromfile(fname).reshape(-1, 2)
+    assert (written == points.reshape(-1, 2)).all()
+
+@pytest.mark.parametrize("density", [False, True])
+def test_chunked_image(monkeypatch, no_show, density):
+    #(ignore falls within the first chunk, and after it)
+    whole = Orbiter(kicks=10, maxIter=400, ignore=50, density=density)
+    whole.image(xSize=300, ySize=200)
+    for points in (80, 1000):
+        monkeypatch.setattr(henon, "CHUNK_POINTS", points)
+        chunked = Orbiter(kicks=10, maxIter=400, ignore=50, density=density)
+        chunked.image(xSize=300, ySize=200)
+        assert (chunked.myArray == whole.myArray).all()
+        if density:
+            assert (chunked.histogram == whole.histogram).all()
+    #end_for_points
+
+def test_other_function():
+    #A subclass with its own function does not get the compiled kernel
+    class Sine(Henon):
+        def function(self, constants, x, y):
+            return self.SUCCESS, 1 - constants[0]*np.sin(x) + y, \
+                   constants[1]*x
+    iteration = Sine(seed=[0.1, 0.1])
+    xs, ys, x, y = iteration.orbit_steps(*iteration.start_points(), 50)
+    assert np.allclose(np.stack((xs, ys), axis=-1),
+                       loop_orbits(iteration, 50))
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Periodicity checking (Brent's method) in kernels.escape_count: the same as
+one point at a time, and no point which escapes is taken to be periodic.
+@author: Owner
+"""
+import pytest
+from kernels import escape_count
+from test_vectorise import square, count_one, plane, per_point
+
+MAX_ITER = 500
+LIMIT = 25
+TOLERANCE = 1e-12
+
+def test_period_check():
+    x, y = plane()
+    count = escape_count(square, 0, 0, x, y, MAX_ITER, LIMIT, TOLERANCE)
+    expected = per_point(x, y, lambda cr, ci: count_one(cr, ci, MAX_ITER,
+                                                        LIMIT, TOLERANCE))
+    assert (count == expected).all()
+    assert (count == escape_count(square, 0, 0, x, y, MAX_ITER, LIMIT)).all()
+
+def test_periodic_orbits_stop():
+    #Points well inside the set are found periodic long before maxIter
+    steps = []
+    def counted(*args):
+        steps.append(1)
+        return square(*args)
+    x, y = plane(-0.5, 0.2, -0.3, 0.3, 9, 7)
+    count = escape_count(counted, 0, 0, x, y, 100000, LIMIT, TOLERANCE)
+    assert (count == -1).all()
+    assert len(steps) < 1000
+
+@pytest.mark.parametrize("name, kwargs", [
+    ("Mandelbrot", {}),
+    #(not c = 0: orbits passing within the tolerance of its repelling fixed
+    #point 1 are, rightly, taken to be periodic)
+    ("Julia", {"seed": [-0.12, 0.75]}),
+])
+def test_generic_period_check(name, kwargs):
+    #The image is the same with periodTolerance 0 (no check)
+    pytest.importorskip("tkinter")
+    pytest.importorskip("myColour")
+    pytest.importorskip("myMathOO")
+    import generic
+    cls = getattr(generic, name)
+    kwargs = dict(kwargs, xSize=96, maxIter=300)
+    checked = cls(None, **kwargs).render()
+    unchecked = cls(None, periodTolerance=0, **kwargs).render()
+    assert (checked == unchecked).all()
+    pixels = cls(None, vectorise=False, **kwargs).render()
+    assert (checked == pixels).all()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The multi-process band renderer (GenIteration.render_tiles): the image and
+results are those of one process, and the copies of the iteration sent to
+the workers do not carry the image with them.
+@author: Owner
+"""
+import pickle
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("myColour")
+pytest.importorskip("myMathOO")
+import generic
+
+@pytest.mark.parametrize("cls", [generic.Mandelbrot, generic.NCubeRoot1])
+def test_processes(cls):
+    single = cls(None, xSize=120)
+    image = single.render()
+    several = cls(None, xSize=120, processes=2)
+    assert (several.render() == image).all()
+    assert several.resultValid
+    assert (several.result == single.result).all()
+
+def test_worker_copy():
+    iteration = generic.Mandelbrot(None, xSize=400)
+    iteration.render()
+    buffers = iteration.iArray.nbytes + iteration.result.nbytes
+    copy = pickle.loads(pickle.dumps(iteration))
+    assert copy.iArray is None and copy.result is None
+    assert len(pickle.dumps(iteration)) < buffers/10
+    #(the original keeps them)
+    assert iteration.iArray is not None
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The Riemann sphere views (module riemann): the vectorised projection and
+iteration give the image of the per-pixel path, and the projection is kept
+for re-use. render_frames gives the images of single views, re-using the
+colours of points already seen, and keeps no projections. With a texture,
+the views look up the colours of the iteration done once for the sphere.
+@author: Owner
+"""
+import numpy as np
+import pytest
+from PIL import Image
+
+pytest.importorskip("myMatrices")
+pytest.importorskip("myColour")
+pytest.importorskip("myMathOO")
+import riemann
+
+VIEW = {"xAngle": 30, "zAngle": 40, "xSize": 80, "maxIter": 60, 
+        "showImage": False}
+
+@pytest.mark.parametrize("kwargs", [{}, {"interiorCheck": False}, 
+                                    {"seed": [0.1, 0.1]}, {"lines": False}])
+def test_vectorised(kwargs):
+    image = riemann.MbrotRIter(**VIEW, **kwargs).compute()
+    pixels = riemann.MbrotRIter(vectorise=False, **VIEW, **kwargs).compute()
+    assert (image == pixels).all()
+    assert np.unique(image.reshape(-1, 3), axis=0).shape[0] > 3
+
+def test_projection_kept():
+    #The same view (angles and size) uses the same projection, also with a 
+    #new maxIter; other angles get their own
+    first = riemann.MbrotRIter(**VIEW)
+    first.compute()
+    projection = first.get_projection(first.xSize, first.ySize)
+    second = riemann.MbrotRIter(**dict(VIEW, maxIter=20))
+    second.compute()
+    assert second.get_projection(second.xSize, second.ySize) is projection
+    second.set_angles(10, 40)
+    assert second.get_projection(second.xSize, second.ySize) \
+           is not projection
+
+def test_projections_bounded(monkeypatch):
+    #Room for two projections of this size: the oldest is forgotten
+    monkeypatch.setattr(riemann.RiemannIteration, "projections", {})
+    iteration = riemann.MbrotRIter(**VIEW)
+    size = sum(a.nbytes for a in 
+               iteration.get_projection(iteration.xSize, iteration.ySize))
+    monkeypatch.setattr(riemann.RiemannIteration, "MAX_PROJECTION_BYTES", 
+                        2*size)
+    for zAngle in (50, 60):
+        iteration.set_angles(30, zAngle)
+        iteration.compute()
+    #end_for_zAngle
+    keys = list(riemann.RiemannIteration.projections)
+    assert keys == [(30, 50, 80, 80), (30, 60, 80, 80)]
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_render_frames(tmp_path, monkeypatch, processes):
+    monkeypatch.setattr(riemann.RiemannIteration, "projections", {})
+    caches = []
+    class PointCache(riemann.PointCache):
+        def __init__(self):
+            super().__init__()
+            caches.append(self)
+    monkeypatch.setattr(riemann, "PointCache", PointCache)
+    iteration = riemann.MbrotRIter(fileDir=str(tmp_path), fileName="f", 
+                                   **VIEW)
+    angles = riemann.angle_path((30, 0), (30, 360), 5)
+    iteration.render_frames(angles, processes=processes)
+    assert (iteration.xAngle, iteration.zAngle) == (30, 40)
+    #No projection kept, from any frame
+    assert riemann.RiemannIteration.projections == {}
+    assert iteration.keepProjections
+    for n, (xAngle, zAngle) in enumerate(angles):
+        single = riemann.MbrotRIter(**dict(VIEW, xAngle=xAngle, 
+                                           zAngle=zAngle))
+        frame = np.array(Image.open(tmp_path/"f_{:04d}.png".format(n)))
+        assert (frame == single.compute()).all()
+    #end_for_n
+    #(the last frame is the first again, so nothing new is iterated)
+    cache = caches[0]
+    assert cache.iterated <= cache.looked*4/5
+
+def test_texture_lookup():
+    #At the centre of each texel the lookup gives that texel, which is the 
+    #colour of the point itself
+    iteration = riemann.MbrotRIter(textureSize=40, **VIEW)
+    texture = iteration.get_texture()
+    assert texture.shape == (40, 80, 3)
+    rows, columns = np.meshgrid(np.arange(40), np.arange(80), indexing="ij")
+    latitude = np.pi/2 - (rows + 0.5)*np.pi/40
+    longitude = (columns + 0.5)*np.pi/40 - np.pi
+    top = 1 - np.sin(latitude)
+    x = (np.cos(latitude)*np.cos(longitude)/top).ravel()
+    y = (np.cos(latitude)*np.sin(longitude)/top).ravel()
+    assert (iteration.texture_lookup(x, y) == texture.reshape(-1, 3)).all()
+    assert (iteration.colour_points(x, y) == texture.reshape(-1, 3)).all()
+    #A new maxIter makes a new texture
+    iteration.maxIter = 20
+    assert iteration.get_texture() is not texture
+
+def test_texture_view(tmp_path):
+    #A fine texture gives nearly the image iterated for the view itself, 
+    #and render_frames the same as compute
+    view = riemann.MbrotRIter(**VIEW).compute()
+    iteration = riemann.MbrotRIter(textureSize=800, **VIEW)
+    image = iteration.compute()
+    assert np.count_nonzero((image != view).any(axis=2)) <= 0.05*view.size/3
+    iteration.fileDir = str(tmp_path)
+    iteration.render_frames([(30, 40)])
+    frame = np.array(Image.open(tmp_path/"temprimage_0000.png"))
+    assert (frame == image).all()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The series approximation of module deepzoom: it skips iterations at a deep
+zoom, and the counts it gives are those of exact_count (Decimal, one point
+at a time) on a sample of the pixels.
+@author: Owner
+"""
+from decimal import Decimal
+import numpy as np
+from deepzoom import reference_orbit, series_approximation, deep_count
+from deepzoom import exact_count, point, probe_points
+
+REFERENCE = (Decimal("-0.74364388703715870"), Decimal("0.13182590420531198"))
+WIDTH = 1e-12
+MAX_ITER = 3000
+LIMIT = 4
+PRECISION = 50
+
+def test_probe_points():
+    probes = probe_points(-1.0, 1.0, -2.0, 2.0)
+    assert probes.size == 9
+    for p in (0, 1j*2, -1, 1, -1 - 2j, 1 + 2j):
+        assert (probes == p).any()
+    #end_for_p
+
+def test_series_approximation():
+    size = 64
+    offsets = np.linspace(-WIDTH/2, WIDTH/2, size)
+    dc = (offsets[np.newaxis, :] + 1j*offsets[:, np.newaxis]).ravel()
+    orbit = reference_orbit(*REFERENCE, 0, 0, MAX_ITER, LIMIT, PRECISION)
+    probes = probe_points(-WIDTH/2, WIDTH/2, -WIDTH/2, WIDTH/2)
+    series = series_approximation(orbit, probes, MAX_ITER, LIMIT)
+    assert series[0] > 0
+    #(more probes never let the series go further than the corners alone)
+    corners = probe_points(-WIDTH/2, WIDTH/2, -WIDTH/2, WIDTH/2)[[0, 2, 6, 8]]
+    assert series[0] <= series_approximation(orbit, corners, MAX_ITER, 
+                                             LIMIT)[0]
+    count = deep_count(dc, REFERENCE, orbit, 0, 0, MAX_ITER, LIMIT,
+                       PRECISION, series)
+    plain = deep_count(dc, REFERENCE, orbit, 0, 0, MAX_ITER, LIMIT,
+                       PRECISION)
+    assert np.count_nonzero(count != plain) <= 0.01*count.size
+    #Against exact_count: a pixel near the boundary, with a long orbit, may
+    #differ through float64 rounding, but then it does without the series
+    sample = np.arange(0, dc.size, 97)
+    exact = np.array([exact_count(*point(REFERENCE, dc[n], PRECISION), 0, 0,
+                                  MAX_ITER, LIMIT, PRECISION) 
+                      for n in sample])
+    wrong = count[sample] != exact
+    assert np.count_nonzero(wrong) <= 0.05*sample.size
+    assert not (wrong & (plain[sample] == exact)).any()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+Mariani-Silver subdivision (GenIteration.subdivide_array): the image is 
+that of iterating every pixel.
+@author: Owner
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("myColour")
+pytest.importorskip("myMathOO")
+import generic
+
+@pytest.mark.parametrize("cls, kwargs", [
+    (generic.Mandelbrot, {}),
+    (generic.Mandelbrot, {"interiorCheck": False, "periodTolerance": 0}),
+    (generic.Julia, {"seed": [-0.12, 0.75], "periodTolerance": 0}),
+    (generic.NCubeRoot1, {}),
+])
+@pytest.mark.parametrize("fill", [0, 0.1, 1])
+def test_subdivide(cls, kwargs, fill):
+    full = cls(None, xSize=160, maxIter=300, **kwargs)
+    image = full.render()
+    subdivided = cls(None, xSize=160, maxIter=300, subdivide=True, **kwargs)
+    subdivided.SUBDIVIDE_FILL = fill
+    assert (subdivided.render() == image).all()
+    #(a filled rectangle takes the result of one of its edge pixels, the 
+    #same colour but perhaps not the same count)
+    index = full.colour_index(full.result)
+    assert (subdivided.colour_index(subdivided.result) == index).all()
+    assert (subdivided.result["inSet"] == full.result["inSet"]).all()
+
+def test_fills():
+    #Where the edges are all one colour, the inside is not iterated
+    iteration = generic.Julia(None, xSize=480, maxIter=300, subdivide=True,
+                              seed=[-0.12, 0.75], periodTolerance=0)
+    iteration.SUBDIVIDE_FILL = 0 #(never stop splitting)
+    iterate_array = iteration.iterate_array
+    iterated = []
+    def counted(xSeed, ySeed, x, y, maxIter, limit):
+        iterated.append(np.broadcast(x, y).size)
+        return iterate_array(xSeed, ySeed, x, y, maxIter, limit)
+    iteration.iterate_array = counted
+    iteration.render()
+    assert sum(iterated) < 0.75*iteration.xSize*iteration.ySize
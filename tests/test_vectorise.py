@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+The vectorised escape-time engine (kernels.escape_count, iterate_array)
+against the same iteration one pixel at a time.
+@author: Owner
+"""
+import numpy as np
+import pytest
+from kernels import escape_count
+
+MAX_ITER = 200
+LIMIT = 25
+
+def square(x, y, cr, ci):
+    #z**2 + c, as generic.Mandelbrot.function (numbers or arrays)
+    xSq = x*x
+    ySq = y*y
+    y = x*y
+    y = y + y + ci
+    x = xSq - ySq + cr
+    return x, y, (xSq + ySq)
+
+def count_one(cReal, cImag, maxIter, limit, tolerance=0):
+    #As generic.Mandelbrot.iterate: the iteration at which c escaped, -1 if
+    #it did not (or its orbit became periodic)
+    zReal = zImag = 0.0
+    xSaved, ySaved, saveAt = zReal, zImag, 1
+    for i in range(maxIter):
+        zReal, zImag, rSq = square(zReal, zImag, cReal, cImag)
+        if rSq > limit:
+            return i
+        if abs(zReal - xSaved) < tolerance \
+           and abs(zImag - ySaved) < tolerance:
+            return -1
+        if i + 1 == saveAt:
+            xSaved, ySaved, saveAt = zReal, zImag, saveAt + saveAt
+    #end_for_i
+    return -1
+
+def plane(xStart=-2.0, xEnd=0.6, yStart=-1.2, yEnd=1.2, xSize=53, ySize=41):
+    x = np.linspace(xStart, xEnd, xSize)[np.newaxis, :]
+    y = np.linspace(yEnd, yStart, ySize)[:, np.newaxis]
+    return x, y
+
+def per_point(x, y, function):
+    return np.array([[function(float(x[0, j]), float(y[i, 0]))
+                      for j in range(x.shape[1])] for i in range(y.shape[0])])
+
+def test_escape_count():
+    x, y = plane()
+    count = escape_count(square, 0, 0, x, y, MAX_ITER, LIMIT)
+    expected = per_point(x, y, lambda cr, ci: count_one(cr, ci, MAX_ITER,
+                                                        LIMIT))
+    assert count.shape == expected.shape
+    assert (count == expected).all()
+    assert (count >= 0).any() and (count < 0).any()
+
+def generic_classes():
+    #(module generic needs myColour and myMathOO)
+    pytest.importorskip("tkinter")
+    pytest.importorskip("myColour")
+    pytest.importorskip("myMathOO")
+    import generic
+    return generic
+
+@pytest.mark.parametrize("name, kwargs", [
+    ("Mandelbrot", {"periodTolerance": 0, "interiorCheck": False}),
+    ("Mandelbrot", {"seed": [0.1, 0.1]}),
+    ("Mandelbar", {}),
+    ("Burning", {}),
+    ("Julia", {"periodTolerance": 0}),
+])
+def test_traverse_array(name, kwargs):
+    #The image is the same with vectorise on or off
+    cls = getattr(generic_classes(), name)
+    iteration = cls(None, xSize=96, maxIter=100, **kwargs)
+    image = iteration.render()
+    assert iteration.resultValid
+    pixels = cls(None, xSize=96, maxIter=100, vectorise=False,
+                 **kwargs).render()
+    assert (image == pixels).all()